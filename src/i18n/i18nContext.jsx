@@ -2,8 +2,23 @@ import React, { createContext, useContext, useState, useEffect } from 'react';
 import enTranslations from './locales/en.json';
 import arTranslations from './locales/ar.json';
 
+// Catalogs of `python -m translation extract`, once it has written messages.js
+const extracted = import.meta.glob('./messages.js', { eager: true })['./messages.js'];
+
 const I18nContext = createContext();
 
+const storedLanguage = () => localStorage.getItem('language') || 'en';
+
+// main.jsx awaits this before importing the app: extracted literals at
+// module level are looked up as their module is evaluated. If a catalog
+// fails to load the keys show instead of a blank page.
+export const loadExtracted = () => {
+  if (!extracted) return Promise.resolve();
+  return extracted.loadMessages(storedLanguage()).catch((error) => {
+    console.error('Could not load the message catalogs', error);
+  });
+};
+
 export const useTranslation = () => {
   const context = useContext(I18nContext);
   if (!context) {
@@ -15,7 +30,7 @@ export const useTranslation = () => {
 export const I18nProvider = ({ children }) => {
   const [language, setLanguage] = useState(() => {
     // Get from localStorage or default to English
-    return localStorage.getItem('language') || 'en';
+    return storedLanguage();
   });
 
   const [translations, setTranslations] = useState(
@@ -45,13 +60,19 @@ export const I18nProvider = ({ children }) => {
   };
 
   const changeLanguage = (lang) => {
-    if (lang === 'ar' || lang === 'en') {
-      setLanguage(lang);
+    if (lang !== 'ar' && lang !== 'en') return;
+    if (extracted && lang !== language) {
+      // Module-level lookups only happen on import: start over in the new
+      // language, main.jsx loads its catalogs first
+      localStorage.setItem('language', lang);
+      window.location.reload();
+      return;
     }
+    setLanguage(lang);
   };
 
   return (
-    <I18nContext.Provider value={{ t, language, changeLanguage }}>
+    <I18nContext.Provider value={{ t, $t: extracted?.$t, language, changeLanguage }}>
       {children}
     </I18nContext.Provider>
   );
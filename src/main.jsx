@@ -1,10 +1,18 @@
 import { StrictMode } from 'react'
 import { createRoot } from 'react-dom/client'
 import './index.css'
-import App from './App.jsx'
+import { I18nProvider, loadExtracted } from './i18n/i18nContext.jsx'
 
-createRoot(document.getElementById('root')).render(
-  <StrictMode>
-    <App />
-  </StrictMode>,
-)
+// The extracted message catalogs (if any) must be loaded before the app's
+// modules look up their strings
+loadExtracted()
+  .then(() => import('./App.jsx'))
+  .then(({ default: App }) => {
+    createRoot(document.getElementById('root')).render(
+      <StrictMode>
+        <I18nProvider>
+          <App />
+        </I18nProvider>
+      </StrictMode>,
+    )
+  })
@@ -0,0 +1,55 @@
+"""Chunked streaming must give exactly the whole-text output."""
+import io
+import random
+
+import pytest
+
+from translation.chunked import translate_chunked
+from translation.journal import revert_edits
+from translation.matcher import Matcher
+from translation.rules import PhasedMatcher
+
+ALPHABET = 'ابودل '
+
+
+def stream(matcher, text, chunk_size):
+    out = io.StringIO()
+    result = translate_chunked(io.StringIO(text), out, matcher, chunk_size)
+    return out.getvalue(), result
+
+
+def random_words(rng, low, high):
+    return ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(low, high))).strip() or 'ا'
+
+
+def test_lower_priority_match_across_the_cut():
+    matcher = Matcher({'دد هه وو زز حح': 'X', 'بب جج دد': 'Y', 'اا بب': 'Z'})
+    text = 'اا بب جج دد هه وو زز حح'
+    assert matcher.translate(text) == 'Z جج X'
+    for chunk_size in range(1, len(text) + 2):
+        assert stream(matcher, text, chunk_size)[0] == 'Z جج X'
+
+
+def test_overlapping_occurrences_all_the_way():
+    matcher = Matcher({'اا': 'X', 'ااا': 'Y'})
+    text = 'ا' * 2000
+    assert stream(matcher, text, 7)[0] == matcher.translate(text)
+
+
+@pytest.mark.parametrize('seed', range(8))
+@pytest.mark.parametrize('clitics', [False, True])
+def test_random_dictionaries_and_chunk_sizes(seed, clitics):
+    rng = random.Random(seed)
+    for _ in range(150):
+        translations = {random_words(rng, 1, 7): rng.choice(['X', 'YY', '', 'Z z'])
+                        for _ in range(rng.randint(1, 8))}
+        matcher = Matcher(translations, clitics=clitics)
+        if rng.random() < 0.3:
+            matcher = PhasedMatcher(matcher, {'pre': [{'literal': 'د', 'replacement': 'دا'}],
+                                              'post': [{'literal': 'X', 'replacement': 'ب'}]})
+        text = ''.join(rng.choice(ALPHABET + 'x') for _ in range(rng.randint(0, 150)))
+        chunk_size = rng.randint(1, 40)
+        output, result = stream(matcher, text, chunk_size)
+        assert output == matcher.translate(text), (translations, text, chunk_size)
+        # The journaled edits take the output back to the input
+        assert revert_edits(output, result.edits)[0] == text
@@ -0,0 +1,20 @@
+"""Command-line parsing shared by the translate*.py scripts."""
+import argparse
+from pathlib import Path
+
+from translation.cli import DATA_FILES, add_common_arguments, collect_files
+
+
+def parse(*argv):
+    return add_common_arguments(argparse.ArgumentParser()).parse_args(argv)
+
+
+def test_json_keeps_the_paths_positional():
+    for argv in (['--json', 'a.json', 'b.json'], ['a.json', 'b.json', '--json']):
+        args = parse(*argv)
+        assert args.json
+        assert collect_files(args, Path('src')) == [Path('a.json'), Path('b.json')]
+
+
+def test_json_without_paths_takes_the_seed_data():
+    assert collect_files(parse('--json'), Path('src')) == [Path(p) for p in DATA_FILES]
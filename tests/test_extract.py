@@ -0,0 +1,59 @@
+"""Extraction: literals become $t() lookups backed by per-chunk catalogs."""
+import argparse
+import json
+
+from translation import extract
+from translation.extract import extractions, js_unescape, message_key
+
+
+def test_each_kind_of_literal_gets_its_lookup():
+    text = ("const a = { 'مفتاح': 'قيمة' };\n"
+            "const b = `قالب ${x}`;\n"
+            "const c = <p title=\"عنوان\">\n  فقرة\n</p>;\n")
+    found = extractions(text, 'pages')
+    assert [e.text for e in found] == ['مفتاح', 'قيمة', 'قالب', 'عنوان', 'فقرة']
+    key = message_key('مفتاح')
+    assert [e.replacement for e in found] == [
+        f"[$t('pages.{key}')]", f"$t('pages.{message_key('قيمة')}')", f"${{$t('pages.{message_key('قالب')}')}}",
+        f"{{$t('pages.{message_key('عنوان')}')}}", f"{{$t('pages.{message_key('فقرة')}')}}"]
+
+
+def test_escapes_are_resolved():
+    assert js_unescape('\\u0645\\x41\\n\\\'') == "مA\n'"
+
+
+def run(tmp_path, monkeypatch, *argv):
+    monkeypatch.chdir(tmp_path)
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clitics', action='store_true')
+    parser.add_argument('--normalize', action='store_true')
+    return extract.run(extract.add_arguments(parser).parse_args(argv))
+
+
+def test_run_writes_catalogs_and_skips_data_modules(tmp_path, monkeypatch):
+    (tmp_path / 'src' / 'pages').mkdir(parents=True)
+    (tmp_path / 'src' / 'services').mkdir()
+    page = tmp_path / 'src' / 'pages' / 'Home.jsx'
+    page.write_text("import React from 'react';\nexport default () => <h1>مرحبا</h1>;\n", encoding='utf-8')
+    service = tmp_path / 'src' / 'services' / 'seed.js'
+    service.write_text("export const name = 'مرحبا';\n", encoding='utf-8')
+    assert run(tmp_path, monkeypatch) == 0
+
+    key = message_key('مرحبا')
+    assert page.read_text(encoding='utf-8') == ("import React from 'react';\n"
+                                                "import { $t } from '../i18n/messages.js';\n"
+                                                f"export default () => <h1>{{$t('pages.{key}')}}</h1>;\n")
+    assert service.read_text(encoding='utf-8') == "export const name = 'مرحبا';\n"
+    locales = tmp_path / 'src' / 'i18n' / 'locales' / 'pages'
+    assert json.loads((locales / 'ar.json').read_text(encoding='utf-8')) == {key: 'مرحبا'}
+    assert key in json.loads((locales / 'en.json').read_text(encoding='utf-8'))
+    assert (tmp_path / 'src' / 'i18n' / 'messages.js').exists()
+    # Nothing left to extract the second time, and the catalogs are kept
+    assert run(tmp_path, monkeypatch) == 0
+    assert json.loads((locales / 'ar.json').read_text(encoding='utf-8')) == {key: 'مرحبا'}
+
+
+def test_unknown_language_is_rejected(tmp_path, monkeypatch, capsys):
+    (tmp_path / 'src').mkdir()
+    assert run(tmp_path, monkeypatch, '--langs', 'en,xx') == 2
+    assert '✗ --langs' in capsys.readouterr().out
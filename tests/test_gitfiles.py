@@ -0,0 +1,58 @@
+"""The pre-commit hook only touches staged sources, never the dictionaries."""
+import argparse
+import io
+import json
+import subprocess
+
+import pytest
+
+from translation import gitfiles
+from translation.translator import Translator
+
+PAGE = "const title = 'مرحبا';\n"
+RULES = {'pre': [{'literal': 'مرحبا', 'replacement': 'مرحباً'}]}
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    subprocess.run(['git', 'init', '-q'], check=True)
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'Page.jsx').write_text(PAGE, encoding='utf-8')
+    dictionaries = tmp_path / 'translation' / 'dictionaries'
+    dictionaries.mkdir(parents=True)
+    (dictionaries / 'rules.json').write_text(json.dumps(RULES, ensure_ascii=False), encoding='utf-8')
+    subprocess.run(['git', 'add', '.'], check=True)
+    return tmp_path
+
+
+def hook(*argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clitics', action='store_true')
+    parser.add_argument('--normalize', action='store_true')
+    args = gitfiles.add_arguments(parser).parse_args(argv)
+    out = io.StringIO()
+    return gitfiles.run(args, out), out.getvalue()
+
+
+def test_check_looks_at_staged_sources_only(repo):
+    status, output = hook('--check')
+    assert status == 1
+    assert 'src/Page.jsx: 1 strings left to translate' in output
+    assert 'rules.json' not in output
+
+
+def test_translate_leaves_the_dictionaries_alone(repo):
+    status, output = hook()
+    assert status == 0
+    assert (repo / 'src' / 'Page.jsx').read_text(encoding='utf-8') == Translator(memory=False).translate(PAGE).text
+    assert 'Translated: src/Page.jsx' in output
+    assert json.loads((repo / 'translation' / 'dictionaries' / 'rules.json').read_text(encoding='utf-8')) == RULES
+    staged = subprocess.run(['git', 'diff', '--cached', '--name-only'], capture_output=True, text=True).stdout
+    assert staged.split() == ['src/Page.jsx', 'translation/dictionaries/rules.json']
+    assert gitfiles.unstaged_files() == []
+
+
+def test_dictionaries_are_skipped_even_when_named(repo):
+    status, output = hook('--src', '.', 'translation/dictionaries/rules.json')
+    assert (status, output) == (0, '')
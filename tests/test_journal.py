@@ -0,0 +1,73 @@
+"""Journal edits: composing passes, reverting them and undoing a run."""
+import io
+import random
+
+import pytest
+
+from translation.journal import Journal, compose_edits, journal_edits, repair_file, revert_edits, undo_run
+from translation.matcher import Matcher
+
+
+def random_pass(rng, text):
+    """A random edit pass over text: (new text, its journal edits)."""
+    translations = {}
+    for _ in range(rng.randint(1, 5)):
+        key = ''.join(rng.choice('ابج') for _ in range(rng.randint(1, 3)))
+        translations.setdefault(key, ''.join(rng.choice('ابجxy') for _ in range(rng.randint(0, 4))))
+    matches = Matcher(translations).matches(text)
+    return Matcher(translations).translate(text), journal_edits(text, matches)
+
+
+def test_revert_puts_the_originals_back():
+    matcher = Matcher({'مرحبا': 'Hello', 'كورس': ''})
+    text = 'مرحبا كورس مرحبا'
+    edits = journal_edits(text, matcher.matches(text))
+    translated = matcher.translate(text)
+    assert translated == 'Hello  Hello'
+    assert revert_edits(translated, edits) == (text, edits, [])
+
+
+def test_changed_span_is_skipped():
+    text, edits = 'Hello world', [[0, 'مرحبا', 'Hello'], [6, 'عالم', 'world']]
+    reverted, done, skipped = revert_edits('Hello there', edits)
+    assert (reverted, done, skipped) == ('مرحبا there', edits[:1], edits[1:])
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_composed_edits_revert_both_passes(seed):
+    rng = random.Random(seed)
+    for _ in range(300):
+        t0 = ''.join(rng.choice('ابج ') for _ in range(rng.randint(0, 20)))
+        t1, first = random_pass(rng, t0)
+        t2, second = random_pass(rng, t1)
+        composed = compose_edits(first, second)
+        assert revert_edits(t2, composed)[0] == t0
+        assert revert_edits(revert_edits(t2, second)[0], first)[0] == t0
+
+
+def test_repair_reverts_only_the_edits_inside_words():
+    matcher = Matcher({'تم': 'Done', 'مرحبا': 'Hello'})
+    text = 'مرحبا يتم تم'
+    translated = matcher.translate(text)
+    assert translated == 'Hello يDone Done'
+    repaired, reverted, remaining = repair_file(translated, journal_edits(text, matcher.matches(text)))
+    assert repaired == 'Hello يتم Done'
+    assert [e[1] for e in reverted] == ['تم']
+    assert revert_edits(repaired, remaining)[0] == text
+
+
+def test_undo_run_restores_the_files(tmp_path):
+    matcher = Matcher({'مرحبا': 'Hello'})
+    source = tmp_path / 'Page.jsx'
+    journal = Journal(tmp_path / 'journal', run_id='run')
+    # Two records for one file, the second made on top of the first (watch mode)
+    text = "const a = 'مرحبا';\n"
+    for added in ('', "const b = 'مرحبا مرحبا';\n"):
+        text += added
+        source.write_text(matcher.translate(text), encoding='utf-8')
+        journal.record(source, journal_edits(text, matcher.matches(text)))
+        text = matcher.translate(text)
+    journal.close()
+    assert undo_run('last', tmp_path / 'journal', io.StringIO()) == 0
+    assert source.read_text(encoding='utf-8') == "const a = 'مرحبا';\nconst b = 'مرحبا مرحبا';\n"
+    assert (tmp_path / 'journal' / 'run.jsonl.undone').exists()
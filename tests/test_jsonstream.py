@@ -0,0 +1,50 @@
+"""JSON string values translate the same whatever the chunk size."""
+import io
+import json
+
+import pytest
+
+from translation.journal import revert_edits
+from translation.jsonstream import json_matches, translate_json_stream
+from translation.matcher import Matcher, apply_matches
+
+MATCHER = Matcher({'مرحبا': 'Hello', 'كورس': 'course "one"'})
+
+DOCUMENT = ('{"مرحبا": "مرحبا يا كورس",\n'
+            ' "list": ["كورس", 1, true, null, {"k": "\\u0645\\u0631\\u062d\\u0628\\u0627"}],\n'
+            ' "escaped": "a \\"quoted\\" مرحبا\\\\", "plain": "no arabic"}\n')
+
+
+def stream(text, chunk_size):
+    out = io.StringIO()
+    result = translate_json_stream(io.StringIO(text), out, MATCHER, chunk_size)
+    return out.getvalue(), result
+
+
+def test_values_are_translated_and_keys_kept():
+    output, result = stream(DOCUMENT, 1 << 16)
+    data = json.loads(output)
+    assert data['مرحبا'] == 'Hello يا course "one"'
+    assert data['list'] == ['course "one"', 1, True, None, {'k': 'Hello'}]
+    assert data['escaped'] == 'a "quoted" Hello\\'
+    assert result.replacements == 5
+    assert output.endswith('"plain": "no arabic"}\n')
+
+
+@pytest.mark.parametrize('chunk_size', range(1, len(DOCUMENT) + 2))
+def test_every_chunk_size_gives_the_same_output(chunk_size):
+    expected, whole = stream(DOCUMENT, len(DOCUMENT))
+    output, result = stream(DOCUMENT, chunk_size)
+    assert output == expected
+    assert result.edits == whole.edits
+    assert revert_edits(output, result.edits)[0] == DOCUMENT
+
+
+def test_json_matches_rebuild_the_stream_output():
+    expected, _ = stream(DOCUMENT, 7)
+    assert apply_matches(DOCUMENT, json_matches(MATCHER, DOCUMENT)) == expected
+
+
+def test_truncated_document_is_passed_through():
+    output, _ = stream('["مرحبا", "كورس', 3)
+    assert output == '["Hello", "كورس'
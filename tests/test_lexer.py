@@ -0,0 +1,39 @@
+"""Which parts of a JS/JSX source the lexer hands to the matcher."""
+from translation.lexer import html_spans, js_spans, translate_source
+from translation.matcher import Matcher
+
+
+def texts(source, **kwargs):
+    return [(source[s.start:s.end], s.kind) for s in js_spans(source, **kwargs)]
+
+
+def test_strings_templates_and_jsx_text():
+    source = ("const a = 'نص' + \"قول\";\n"
+              "const b = `قالب ${x} بعد`;\n"
+              "return <p title='عنوان'>فقرة {y}</p>;\n")
+    assert texts(source) == [('نص', 'string'), ('قول', 'string'), ('قالب ', 'template'),
+                             (' بعد', 'template'), ('عنوان', 'attr'), ('فقرة ', 'jsx')]
+
+
+def test_code_regexes_and_comments_are_skipped():
+    source = "// تعليق\nconst re = /'ع'/g; /* كتلة */ x = a / b / 'نص';\n"
+    assert texts(source) == [('نص', 'string')]
+    assert texts(source, include_comments=True)[0] == (' تعليق', 'comment')
+
+
+def test_nested_templates_and_jsx_expressions():
+    source = ("const a = `خارج ${cond ? `داخل` : 'نص'}`;\n"
+              "const b = <div>{ok && <span>مرحبا</span>}</div>;\n")
+    assert [t for t, _ in texts(source) if t] == ['خارج ', 'داخل', 'نص', 'مرحبا']
+
+
+def test_replacements_are_escaped_for_their_span():
+    matcher = Matcher({'نص': "it's", 'قالب': '`tick` ${x}', 'فقرة': '{a} <b>'})
+    source = "f('نص'); g(`قالب`); <p>فقرة</p>;"
+    assert translate_source(matcher, source) == ("f('it\\'s'); g(`\\`tick\\` \\${x}`); "
+                                                 "<p>&#123;a&#125; &lt;b&gt;</p>;")
+
+
+def test_html_text_and_attributes():
+    source = '<html><!-- تعليق --><script>var a = "نص";</script><p class="ع">فقرة</p></html>'
+    assert [(source[s.start:s.end], s.kind) for s in html_spans(source)] == [('ع', 'attr'), ('فقرة', 'jsx')]
@@ -0,0 +1,34 @@
+"""Manifest invalidation when dictionary entries change."""
+from translation.manifest import Manifest, file_entry
+
+
+def translated_once(tmp_path, text, options):
+    source = tmp_path / 'Page.jsx'
+    source.write_text(text, encoding='utf-8')
+    manifest = Manifest(tmp_path / 'manifest.json', {'مرحبا': 'Hello'}, options)
+    manifest.record(source, file_entry(source))
+    manifest.save()
+    return source
+
+
+def test_unrelated_entry_keeps_the_file_fresh(tmp_path):
+    source = translated_once(tmp_path, "const a = 'سيارة';\n", {})
+    manifest = Manifest.load(tmp_path / 'manifest.json', {'مرحبا': 'Hello', 'كتاب': 'Book'}, {})
+    assert manifest.is_fresh(source)
+
+
+def test_new_entry_found_in_the_file_invalidates_it(tmp_path):
+    source = translated_once(tmp_path, "const a = 'سيارة';\n", {})
+    manifest = Manifest.load(tmp_path / 'manifest.json', {'مرحبا': 'Hello', 'سيارة': 'Car'}, {})
+    assert not manifest.is_fresh(source)
+
+
+def test_other_spelling_invalidates_only_when_normalizing(tmp_path):
+    translations = {'مرحبا': 'Hello', 'سيّارة': 'Car'}
+    source = translated_once(tmp_path, "const a = 'سيارة';\n", {})
+    assert Manifest.load(tmp_path / 'manifest.json', translations, {}).is_fresh(source)
+
+    source = translated_once(tmp_path, "const a = 'سيارة';\n", {'normalize': True})
+    manifest = Manifest.load(tmp_path / 'manifest.json', translations, {'normalize': True})
+    assert not manifest.is_fresh(source)
+    assert manifest.invalidated == 1
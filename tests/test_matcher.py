@@ -0,0 +1,72 @@
+"""Matcher priority, clitic mode and apply_matches."""
+import random
+
+import pytest
+
+from translation.matcher import Match, Matcher, apply_matches
+
+
+def replace_loop(translations, text):
+    # What the scripts did before the automaton
+    for key, value in sorted(translations.items(), key=lambda x: len(x[0]), reverse=True):
+        text = text.replace(key, value)
+    return text
+
+
+def test_longer_key_wins():
+    matcher = Matcher({'كورس': 'course', 'الكورسات': 'the courses'})
+    assert matcher.translate('الكورسات والكورس') == 'the courses والcourse'
+
+
+def test_tie_goes_to_the_earlier_key():
+    matcher = Matcher({'بج': 'X', 'اب': 'Y'})
+    assert matcher.translate('ابج') == 'اX'
+    matcher = Matcher({'اب': 'Y', 'بج': 'X'})
+    assert matcher.translate('ابج') == 'Yج'
+
+
+def test_same_key_is_taken_left_to_right():
+    assert Matcher({'اا': 'X'}).translate('ااا') == 'Xا'
+
+
+def test_matches_stay_within_the_span():
+    matcher = Matcher({'مرحبا': 'Hello'})
+    text = 'مرحبا مرحبا مرحبا'
+    assert [(m.start, m.end) for m in matcher.matches(text, 3, 12)] == [(6, 11)]
+
+
+def test_escape_is_applied_to_replacements():
+    matcher = Matcher({'مرحبا': "it's"})
+    [match] = matcher.matches('مرحبا', escape=lambda s: s.replace("'", "\\'"))
+    assert match == Match(0, 5, 'مرحبا', "it\\'s")
+
+
+def test_clitics_match_whole_words_behind_a_proclitic():
+    matcher = Matcher({'كورسات': 'courses', 'تم': 'Done'}, clitics=True)
+    assert matcher.translate('والكورسات يتم تم') == 'and the courses يتم Done'
+    [match] = matcher.matches('والكورسات')
+    assert (match.start, match.prefix) == (0, 'وال')
+
+
+def test_clitics_drop_entries_derivable_from_a_proclitic():
+    matcher = Matcher({'كورسات': 'courses', 'الكورسات': 'the courses'}, clitics=True)
+    assert matcher.keys == ['كورسات']
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_same_output_as_the_replace_loop(seed):
+    rng = random.Random(seed)
+    translations = {}
+    while len(translations) < 12:
+        key = ''.join(rng.choice('ابجد') for _ in range(rng.randint(1, 4)))
+        translations.setdefault(key, f'<{len(translations)}>')
+    for _ in range(200):
+        text = ''.join(rng.choice('ابجد ') for _ in range(rng.randint(0, 30)))
+        assert Matcher(translations).translate(text) == replace_loop(translations, text)
+
+
+def test_apply_matches():
+    text = 'اا بب جج'
+    matches = [Match(0, 2, 'اا', 'A'), Match(6, 8, 'جج', '')]
+    assert apply_matches(text, matches) == 'A بب '
+    assert apply_matches(text, []) is text
@@ -0,0 +1,63 @@
+"""Translation memory: LRU bounds, keys and invalidation."""
+from translation.lexer import escaper
+from translation.matcher import Matcher
+from translation.memory import MAX_LITERAL, MemoryMatcher, TranslationMemory, memory_path
+
+STRING = escaper('string', "'")
+
+
+def test_lru_drops_the_least_recently_used():
+    memory = TranslationMemory(capacity=2)
+    memory.put('a', ())
+    memory.put('b', ())
+    assert memory.get('a') == ()
+    memory.put('c', ())
+    assert list(memory.entries) == ['a', 'c']
+    assert (memory.hits, memory.misses) == (1, 0)
+    assert memory.get('b') is None and memory.misses == 1
+
+
+def test_literal_is_matched_once_and_reused():
+    memory = TranslationMemory()
+    matcher = MemoryMatcher(Matcher({'مرحبا': "it's"}), memory)
+    text = "a('مرحبا'); b('مرحبا');"
+    first = matcher.matches(text, 3, 8, STRING)
+    second = matcher.matches(text, 15, 20, STRING)
+    assert [(m.start, m.end, m.replacement) for m in first + second] == [(3, 8, "it\\'s"), (15, 20, "it\\'s")]
+    assert (memory.hits, memory.misses) == (1, 1)
+    assert list(matcher.take_learned()) == [((), ('string', "'"), 'مرحبا')]
+    assert matcher.take_learned() == {}
+
+
+def test_escaping_and_overlays_are_part_of_the_key():
+    memory = TranslationMemory()
+    plain = MemoryMatcher(Matcher({'مرحبا': "it's"}), memory)
+    scoped = MemoryMatcher(Matcher({'مرحبا': 'Hi'}), memory, ('earnings',))
+    assert plain.translate('مرحبا') == "it's"
+    assert plain.matches('مرحبا', escape=STRING)[0].replacement == "it\\'s"
+    assert scoped.matches('مرحبا', escape=STRING)[0].replacement == 'Hi'
+    assert len(memory.entries) == 3
+
+
+def test_long_texts_bypass_the_memory():
+    memory = TranslationMemory()
+    matcher = MemoryMatcher(Matcher({'مرحبا': 'Hello'}), memory)
+    text = 'مرحبا ' * (MAX_LITERAL // 6 + 1)
+    assert len(matcher.matches(text, escape=STRING)) == MAX_LITERAL // 6 + 1
+    assert not memory.entries
+
+
+def test_saved_memory_loads_back(tmp_path):
+    path = tmp_path / 'memory.pickle'
+    memory = TranslationMemory(path=path)
+    memory.put(((), None, 'مرحبا'), ((0, 5, 'مرحبا', 'Hello', ''),))
+    memory.save()
+    assert TranslationMemory.load(path).entries == memory.entries
+    assert TranslationMemory.load(tmp_path / 'missing.pickle').entries == {}
+
+
+def test_dictionary_or_options_change_the_file(tmp_path):
+    path = memory_path({'مرحبا': 'Hello'}, {'clitics': False}, tmp_path)
+    assert path == memory_path({'مرحبا': 'Hello'}, {'clitics': False}, tmp_path)
+    assert path != memory_path({'مرحبا': 'Hi'}, {'clitics': False}, tmp_path)
+    assert path != memory_path({'مرحبا': 'Hello'}, {'clitics': True}, tmp_path)
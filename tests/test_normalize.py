@@ -0,0 +1,48 @@
+"""Normalized matching and the offsets back to the source."""
+import random
+
+import pytest
+
+from translation.matcher import Matcher
+from translation.normalize import NormalizedMatcher, OffsetMap, normalize, normalize_keys
+
+
+def test_marks_are_dropped_and_letters_folded():
+    assert normalize('مَرْحَباً') == 'مرحبا'
+    assert normalize('مـــرحبا') == 'مرحبا'
+    assert normalize('إدارة أولى آخر') == 'ادارة اولي اخر'
+
+
+def test_first_spelling_wins():
+    assert normalize_keys({'إدارة': 'Admin', 'ادارة': 'admin'}) == {'ادارة': 'Admin'}
+
+
+def test_offset_map_points_back_into_the_source():
+    text = 'اَلْـكتاب'
+    view = normalize(text)
+    offsets = OffsetMap(text)
+    assert view == 'الكتاب'
+    # Every view offset lands right after the same letter in the source
+    for i in range(1, len(view) + 1):
+        assert normalize(text[:offsets.original(i)]) == view[:i]
+    assert offsets.original(0) == 0
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_offset_map_on_random_text(seed):
+    rng = random.Random(seed)
+    for _ in range(200):
+        text = ''.join(rng.choice('ابَـًّ ') for _ in range(rng.randint(0, 20)))
+        view = normalize(text)
+        offsets = OffsetMap(text)
+        for i in range(len(view) + 1):
+            j = offsets.original(i)
+            assert normalize(text[:j]) == view[:i]
+            assert j == len(text) or normalize(text[j]) != '' or i == len(view)
+
+
+def test_matches_cover_the_original_spelling():
+    matcher = NormalizedMatcher(Matcher(normalize_keys({'مرحبا': 'Hello', 'إدارة': 'Admin'})))
+    text = "f('مَرحباً', 'الادارة', 'مــرحبا')"
+    assert matcher.translate(text) == "f('Hello', 'الAdmin', 'Hello')"
+    assert [(m.start, m.end) for m in matcher.matches(text, 3, 10)] == [(3, 10)]
@@ -0,0 +1,26 @@
+"""map_files keeps the order and reads a lazy walk only a bounded window ahead."""
+from translation.pool import CHUNKSIZE, TASKS_PER_WORKER, map_files
+
+
+def square(n):
+    return n * n
+
+
+def test_results_come_in_the_order_given():
+    assert list(map_files(square, list(range(50)), jobs=3)) == [n * n for n in range(50)]
+    assert list(map_files(square, iter(range(50)), jobs=1)) == [n * n for n in range(50)]
+
+
+def test_lazy_walk_is_consumed_as_work_is_handed_out():
+    consumed = []
+
+    def walk():
+        for n in range(200):
+            consumed.append(n)
+            yield n
+
+    results = map_files(square, walk(), jobs=2)
+    assert next(results) == 0
+    # The window that was handed out up front, plus the task that replaced the first
+    assert len(consumed) == (2 * TASKS_PER_WORKER + 1) * CHUNKSIZE
+    assert list(results) == [n * n for n in range(1, 200)]
@@ -0,0 +1,41 @@
+"""Residual scan: runs left in translatable spans and the n-gram ranking."""
+from translation.residual import FileScan, ResidualReport, ngrams, scan_file
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return path
+
+
+def test_ngrams_up_to_three_words():
+    assert list(ngrams(['ا', 'ب', 'ج', 'د'])) == ['ا', 'ب', 'ج', 'د', 'ا ب', 'ب ج', 'ج د',
+                                                'ا ب ج', 'ب ج د']
+
+
+def test_scan_keeps_lines_and_skips_comments(tmp_path):
+    path = write(tmp_path, 'Page.jsx', "// تعليق\nconst a = 'حفظ الملف';\nreturn <p>إلغاء</p>;\n")
+    scan = scan_file(path)
+    assert [(r.line, r.text) for r in scan.runs] == [(2, 'حفظ الملف'), (3, 'إلغاء')]
+    assert scan.ngrams['حفظ الملف'] == 1
+    assert [r.text for r in scan_file(path, include_comments=True).runs][0] == 'تعليق'
+
+
+def test_words_glued_to_latin_are_fragments(tmp_path):
+    scan = scan_file(write(tmp_path, 'Page.jsx', "const a = 'الCourse جديد';\n"))
+    assert scan.fragments == 1
+    assert list(scan.ngrams) == ['جديد']
+
+
+def test_file_without_arabic_has_no_runs(tmp_path):
+    assert scan_file(write(tmp_path, 'Page.jsx', "const a = 'x';\n")).runs == []
+
+
+def test_ranking_weighs_counts_by_files_and_skips_known_keys(tmp_path):
+    report = ResidualReport(known={'تم'})
+    report.add(scan_file(write(tmp_path, 'A.jsx', "f('حفظ'); f('حفظ'); f('تم'); f('إلغاء');\n")))
+    report.add(scan_file(write(tmp_path, 'B.jsx', "f('إلغاء');\n")))
+    report.add(FileScan(tmp_path / 'C.jsx', [], {}, 0, error='boom'))
+    assert report.ranked() == [('إلغاء', 4, 2, 2), ('حفظ', 2, 2, 1)]
+    assert report.stub(top=1) == {'إلغاء': ''}
+    assert (report.scanned, len(report.errors)) == (3, 1)
@@ -0,0 +1,55 @@
+"""Path-scoped overlays: which files get which matcher."""
+import json
+
+from translation.scopes import Scopes, ScopedMatcher, matcher_for, scoped_matcher
+from translation.store import DictionaryStore
+
+SCOPES = [{'paths': ['src/instructor/'], 'layers': ['earnings']},
+          {'paths': ['src/instructor/Panel.jsx', 'src/admin/'], 'layers': ['panel', 'earnings']}]
+
+
+def make_store(tmp_path, scopes, **layers):
+    for name, entries in layers.items():
+        (tmp_path / f'{name}.json').write_text(json.dumps(entries, ensure_ascii=False), encoding='utf-8')
+    (tmp_path / 'scopes.json').write_text(json.dumps({'scopes': scopes}), encoding='utf-8')
+    return DictionaryStore(tmp_path)
+
+
+def test_overlays_follow_the_order_of_the_scopes():
+    scopes = Scopes(SCOPES)
+    assert scopes.layers() == ('earnings', 'panel')
+    assert scopes.overlays('src/instructor/Tab.jsx') == ('earnings',)
+    assert scopes.overlays('src/instructor/Panel.jsx') == ('earnings', 'panel')
+    assert scopes.overlays('src/admin/Users.jsx') == ('panel', 'earnings')
+    assert scopes.overlays('src/App.jsx') == ()
+
+
+def test_missing_scopes_file_has_no_scopes(tmp_path):
+    assert not Scopes.load(tmp_path / 'scopes.json')
+
+
+def test_overlay_wins_only_inside_its_scope(tmp_path):
+    store = make_store(tmp_path, SCOPES, base={'رصيد': 'Credit', 'مرحبا': 'Hello'},
+                       earnings={'رصيد': 'Balance'}, panel={'مرحبا': ''})
+    matcher = scoped_matcher(store)
+    assert isinstance(matcher, ScopedMatcher)
+    assert matcher.translate('رصيد مرحبا') == 'Credit Hello'
+    assert matcher.for_path('src/instructor/Tab.jsx').translate('رصيد مرحبا') == 'Balance Hello'
+    assert matcher.for_path('src/admin/Users.jsx').translate('رصيد مرحبا') == 'Balance '
+
+
+def test_combinations_are_built_once_and_shared(tmp_path):
+    store = make_store(tmp_path, SCOPES, base={'رصيد': 'Credit'}, earnings={'رصيد': 'Balance'}, panel={})
+    matcher = scoped_matcher(store)
+    first = matcher.for_path('src/instructor/Tab.jsx')
+    assert matcher.for_path('src/instructor/Other.jsx') is first
+    assert matcher.for_path('src/App.jsx') is matcher.base
+    assert matcher_for(matcher, 'src/instructor/Panel.jsx')[1] == ('earnings', 'panel')
+    assert matcher_for(matcher, None) == (matcher, ())
+
+
+def test_store_without_scopes_gives_the_plain_matcher(tmp_path):
+    store = make_store(tmp_path, [], base={'مرحبا': 'Hello'})
+    matcher = scoped_matcher(store)
+    assert not isinstance(matcher, ScopedMatcher)
+    assert matcher_for(matcher, 'src/App.jsx') == (matcher, ())
@@ -0,0 +1,53 @@
+"""--serve requests and their error replies."""
+import io
+import json
+
+import pytest
+
+from translation.server import Server
+from translation.store import DictionaryStore
+from translation.translator import Translator
+
+
+@pytest.fixture
+def server(tmp_path):
+    (tmp_path / 'base.json').write_text(json.dumps({'مرحبا': 'Hello'}), encoding='utf-8')
+    return Server(Translator(DictionaryStore(tmp_path), memory=False), io.StringIO())
+
+
+def request(server, **fields):
+    return server.handle(json.dumps(fields))
+
+
+def test_text_request(server):
+    response = request(server, id=1, text="f('مرحبا')", matches=True)
+    assert response['id'] == 1
+    assert response['text'] == "f('Hello')"
+    assert response['entries'] == {'مرحبا': 1}
+    assert response['matches'] == [[3, 8, 'مرحبا', 'Hello']]
+
+
+def test_path_request_with_write(server, tmp_path):
+    source = tmp_path / 'Page.jsx'
+    source.write_text("f('مرحبا')", encoding='utf-8')
+    response = request(server, id=2, path=str(source), write=True)
+    assert 'text' not in response and response['replacements'] == 1
+    assert source.read_text(encoding='utf-8') == "f('Hello')"
+
+
+@pytest.mark.parametrize('fields', [{'path': 1}, {'path': ['a.jsx']}, {'text': 1}, {}, {'op': 'nope'},
+                                    {'text': 'مرحبا', 'kind': 'yaml'}])
+def test_bad_requests_get_an_error_reply(server, fields):
+    response = request(server, id=3, **fields)
+    assert response['id'] == 3 and 'error' in response
+    assert server.errors == 1
+
+
+def test_pipelined_requests_are_answered_in_order(server):
+    texts = [repr(' '.join(['مرحبا'] * n)) for n in range(5)]
+    lines = ''.join(json.dumps({'id': n, 'text': text}) + '\n' for n, text in enumerate(texts)) + '\nnot json\n'
+    server.run(io.StringIO(lines))
+    responses = [json.loads(line) for line in server.out.getvalue().splitlines()]
+    assert [r['id'] for r in responses] == [0, 1, 2, 3, 4, None]
+    assert [r.get('replacements') for r in responses] == [0, 1, 2, 3, 4, None]
+    assert request(server, op='stats')['requests'] == 7
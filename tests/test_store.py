@@ -0,0 +1,40 @@
+"""The word layer and validate's in-word check."""
+import json
+
+from translation.store import DictionaryStore
+
+
+def make_store(tmp_path, **layers):
+    for name, entries in layers.items():
+        (tmp_path / f'{name}.json').write_text(json.dumps(entries, ensure_ascii=False), encoding='utf-8')
+    return DictionaryStore(tmp_path)
+
+
+def test_word_layer_only_matches_whole_words(tmp_path):
+    store = make_store(tmp_path, words={'تم': 'Done'}, base={'مرحبا': 'Hello'})
+    assert store.matcher().translate('تم يتم مرحبا') == 'Done يتم Hello'
+    assert store.matcher(normalize=True).translate('تم يتم مرحبا') == 'Done يتم Hello'
+    assert store.matcher(clitics=True).translate('وتم يتم مرحبا') == 'and Done يتم Hello'
+
+
+def test_later_layer_changes_the_value_of_a_word(tmp_path):
+    store = make_store(tmp_path, words={'جديد': 'New'}, overrides={'جديد': 'new'})
+    assert store.matcher().translate('جديد جديدة') == 'new جديدة'
+
+
+def test_short_keys_stay_out_of_longer_words():
+    # Default runs used to write 'المرandر', 'اNoسم' and 'الaboutandان'
+    matcher = DictionaryStore().matcher()
+    assert matcher.translate('المرور الاسم العنوان') == 'المرور الاسم العنوان'
+    assert matcher.translate('و لا عن') == 'and No about'
+
+
+def test_validate_flags_keys_inside_longer_words(tmp_path):
+    (tmp_path / 'dictionaries').mkdir()
+    store = make_store(tmp_path / 'dictionaries', base={'تم': 'Done', 'مرحبا': 'Hello'})
+    source = tmp_path / 'Page.jsx'
+    source.write_text("const a = 'مرحبا';\nconst b = 'يتم الحفظ';\n", encoding='utf-8')
+    issues = store.validate(files=[source])
+    assert [(i.kind, i.key) for i in issues] == [('in-word', 'تم')]
+    assert f"'يتم' at {source}:2" in issues[0].message
+    assert store.validate(clitics=True, files=[source]) == []
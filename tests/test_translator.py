@@ -0,0 +1,52 @@
+"""Translator API: kinds, the JSON \\u escapes and files."""
+import json
+
+import pytest
+
+from translation.pipeline import translate_json_file
+from translation.store import DictionaryStore
+from translation.translator import Translator, kind_of
+
+
+@pytest.fixture
+def translator(tmp_path):
+    (tmp_path / 'base.json').write_text(json.dumps({'مرحبا': 'Hello', 'عالم': 'world'}), encoding='utf-8')
+    return Translator(DictionaryStore(tmp_path), memory=False)
+
+
+def test_kind_follows_the_extension():
+    assert [kind_of(p) for p in ('a.jsx', 'b.JSON', 'c.html', 'd.md', None)] == ['js', 'json', 'html', 'text', 'js']
+
+
+def test_js_translates_literals_only(translator):
+    source = "const مرحبا = 'مرحبا عالم'; // مرحبا\n"
+    assert translator.translate(source).text == "const مرحبا = 'Hello world'; // مرحبا\n"
+    assert translator.translate(source, kind='text').text == "const Hello = 'Hello world'; // Hello\n"
+
+
+def test_bytes_and_streams_are_decoded(translator):
+    assert translator.translate('مرحبا'.encode('utf-8'), kind='text').text == 'Hello'
+
+
+def test_json_values_written_as_escapes(translator, tmp_path):
+    source = tmp_path / 'data.json'
+    source.write_text('{"مرحبا": "\\u0645\\u0631\\u062d\\u0628\\u0627"}', encoding='utf-8')
+    result, _ = translator.translate_path(source)
+    assert json.loads(result.text) == {'مرحبا': 'Hello'}
+    assert len(result.matches) == 1
+    # Same as the CLI's pipeline
+    translate_json_file(source, translator.matcher)
+    assert source.read_text(encoding='utf-8') == result.text
+
+
+def test_unknown_kind(translator):
+    with pytest.raises(ValueError):
+        translator.translate('مرحبا', kind='yaml')
+
+
+def test_write_replaces_the_file_and_returns_its_edits(translator, tmp_path):
+    source = tmp_path / 'Page.jsx'
+    source.write_text("f('مرحبا');\n", encoding='utf-8')
+    result, edits = translator.translate_path(source, write=True)
+    assert source.read_text(encoding='utf-8') == "f('Hello');\n" == result.text
+    assert edits == [[3, 'مرحبا', 'Hello']]
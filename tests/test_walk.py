@@ -0,0 +1,29 @@
+"""Ignore rules and the scandir walk."""
+import pytest
+
+from translation.walk import IgnoreRules, walk
+
+
+@pytest.mark.parametrize('negated', [False, True])
+def test_gitignore_patterns(negated):
+    patterns = ['dist/', 'src/legacy/*.jsx', '**/gen/**', '*.test.js']
+    rules = IgnoreRules(patterns + (['!keep.test.js'] if negated else []))
+    assert rules.ignored('dist', is_dir=True) and not rules.ignored('dist')
+    assert rules.ignored('src/legacy/Old.jsx') and not rules.ignored('src/legacy/deep/Old.jsx')
+    assert not rules.ignored('lib/src/legacy/Old.jsx')
+    assert rules.ignored('a/gen/b/c.js')
+    assert rules.ignored('src/x.test.js')
+    assert rules.ignored('keep.test.js') is not negated
+    assert rules.excludes('src/dist/App.jsx')
+
+
+def test_walk_prunes_and_filters(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ('src/b/B.jsx', 'src/a.js', 'src/a.css', 'src/node_modules/x/i.js', 'src/skip/S.jsx'):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text('', encoding='utf-8')
+    ignore = IgnoreRules().add_file('missing.gitignore')
+    ignore.add('src/skip/')
+    found = [p.as_posix() for p in walk(['src', 'src/a.css', 'src/a.js'], ignore=ignore)]
+    assert found == ['src/a.js', 'src/b/B.jsx', 'src/a.css']
+    assert [p.as_posix() for p in walk(['src'], ('.css',))] == ['src/a.css']
@@ -0,0 +1,54 @@
+"""Watch mode: which saves are seen, and our own writes are not."""
+import threading
+
+import pytest
+
+from translation.watch import PollingWatcher, WatchTarget, open_watcher, watch
+
+
+def jsx_target(root):
+    return WatchTarget([root], lambda p: p.suffix == '.jsx', skip_dir=lambda p: p.name == 'node_modules')
+
+
+def test_polling_sees_changed_wanted_files(tmp_path):
+    watcher = PollingWatcher(jsx_target(tmp_path), interval=0.01)
+    (tmp_path / 'Page.jsx').write_text('a', encoding='utf-8')
+    (tmp_path / 'notes.txt').write_text('a', encoding='utf-8')
+    (tmp_path / 'node_modules').mkdir()
+    (tmp_path / 'node_modules' / 'Lib.jsx').write_text('a', encoding='utf-8')
+    assert watcher.wait() == {tmp_path / 'Page.jsx'}
+    assert watcher.wait() == set()
+
+
+def test_inotify_sees_files_in_new_directories(tmp_path):
+    try:
+        watcher = open_watcher(jsx_target(tmp_path), 'inotify')
+    except (OSError, AttributeError):
+        pytest.skip('no inotify here')
+    try:
+        (tmp_path / 'pages').mkdir()
+        (tmp_path / 'pages' / 'Home.jsx').write_text('a', encoding='utf-8')
+        changed = set()
+        for _ in range(20):
+            changed |= watcher.wait(0.05)
+        assert changed == {tmp_path / 'pages' / 'Home.jsx'}
+    finally:
+        watcher.close()
+
+
+def test_own_writes_are_not_processed_again(tmp_path):
+    first, second = tmp_path / 'A.jsx', tmp_path / 'B.jsx'
+    processed = []
+
+    def process_file(path):
+        processed.append(path)
+        path.write_text('translated', encoding='utf-8')
+        return path
+
+    threading.Timer(0.1, first.write_text, ('مرحبا',), {'encoding': 'utf-8'}).start()
+    results = watch(jsx_target(tmp_path), process_file, mode='poll')
+    assert next(results) == (first, first)
+    threading.Timer(0.1, second.write_text, ('مرحبا',), {'encoding': 'utf-8'}).start()
+    assert next(results) == (second, second)
+    results.close()
+    assert processed == [first, second]
@@ -0,0 +1,14 @@
+"""Shared engine behind the translate*.py scripts."""
+from .cache import compile_matcher, dictionary_hash
+from .lexer import Span, js_spans, source_matches, translate_source
+from .matcher import Match, Matcher, apply_matches
+from .pipeline import FileResult, translate_file
+from .pool import map_files, resolve_jobs
+from .rules import PhasedMatcher
+from .scopes import ScopedMatcher
+from .store import DictionaryStore
+from .translator import Translation, Translator
+
+__all__ = ['DictionaryStore', 'FileResult', 'Match', 'Matcher', 'PhasedMatcher', 'ScopedMatcher', 'Span',
+           'Translation', 'Translator', 'apply_matches', 'compile_matcher', 'dictionary_hash', 'js_spans',
+           'map_files', 'resolve_jobs', 'source_matches', 'translate_file', 'translate_source']
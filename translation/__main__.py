@@ -0,0 +1,64 @@
+"""python -m translation <command>: engine tools that work on a single stream or the store."""
+import argparse
+import sys
+from pathlib import Path
+
+from . import bench, extract, gitfiles, residual
+from .jsonstream import translate_json_stream
+from .server import serve
+from .store import DictionaryStore, report_issues
+from .translator import Translator
+from .walk import IgnoreRules, walk
+
+
+def _validate(args):
+    files = walk(args.paths or [Path('src')], ignore=IgnoreRules().add_file('.gitignore'))
+    return 1 if report_issues(DictionaryStore(), clitics=args.clitics, normalize=args.normalize, files=files) else 0
+
+
+def _json(args):
+    # python -m translation json < export.json > export.en.json
+    sys.stdin.reconfigure(encoding='utf-8', newline='')
+    sys.stdout.reconfigure(encoding='utf-8', newline='')
+    matcher = DictionaryStore().matcher(clitics=args.clitics, normalize=args.normalize)
+    result = translate_json_stream(sys.stdin, sys.stdout, matcher)
+    print(f'{result.replacements} replacements', file=sys.stderr)
+    return 0
+
+
+def _serve(args):
+    return serve(Translator(clitics=args.clitics, include_comments=args.include_comments,
+                            normalize=args.normalize))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m translation')
+    parser.add_argument('--clitics', action='store_true',
+                        help='match whole Arabic words only, allowing و/ف/ب/ل/ال in front')
+    parser.add_argument('--normalize', action='store_true',
+                        help='ignore tashkeel, tatweel and alef / ya spelling variants when matching')
+    commands = parser.add_subparsers(dest='command', required=True)
+    validate_parser = commands.add_parser('validate', help='check the dictionary store for conflicts, dead '
+                                                           'keys and keys that match inside longer words')
+    validate_parser.add_argument('paths', nargs='*', type=Path,
+                                 help='where to look for keys matching inside longer words (default: src)')
+    commands.add_parser('json', help='translate JSON string values from stdin to stdout')
+    serve_parser = commands.add_parser('serve', help='answer JSON-lines translation requests on '
+                                                     'stdin/stdout with the matcher kept loaded')
+    serve_parser.add_argument('--include-comments', action='store_true',
+                              help='also translate Arabic inside // and /* */ comments')
+    bench.add_arguments(commands.add_parser('bench', help='benchmark the engines on synthetic corpora'))
+    extract.add_arguments(commands.add_parser('extract', help='move Arabic literals under src/ into '
+                                                              'per-locale message catalogs'))
+    residual.add_arguments(commands.add_parser('residual', help='rank the Arabic left under src/ and '
+                                                                'write a dictionary stub'))
+    gitfiles.add_arguments(commands.add_parser('pre-commit', help='translate (or --check) the staged '
+                                                                  '.js/.jsx/.json files'))
+    args = parser.parse_args(argv)
+    commands = {'validate': _validate, 'json': _json, 'bench': bench.run, 'extract': extract.run,
+                'residual': residual.run, 'serve': _serve, 'pre-commit': gitfiles.run}
+    return commands[args.command](args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""Arabic script helpers: letter classes and proclitics."""
+import re
+
+# Letters, tashkeel and tatweel: everything that can sit inside one word
+ARABIC_LETTERS = frozenset(
+    chr(c) for c in list(range(0x0621, 0x065F + 1)) + list(range(0x066E, 0x06D3 + 1)) + list(range(0x06FA, 0x06FF + 1))
+)
+
+ARABIC_WORD = re.compile(r'[؀-ۿ]+')
+
+# Arabic written raw or as a \u06xx escape (JSON string tokens)
+ARABIC_OR_ESCAPE = re.compile(r'[؀-ۿ]|\\u06[0-9a-fA-F]{2}')
+
+# Words made of letters only (no Arabic punctuation or digits), and runs of
+# them on one line
+LETTER_WORD = re.compile(r'[\u0621-\u065f\u066e-\u06d3\u06fa-\u06ff]+')
+LETTER_RUN = re.compile(r'%s(?:[ \xa0]+%s)*' % (LETTER_WORD.pattern, LETTER_WORD.pattern))
+
+# Proclitics that attach to the front of a word, with what they add in English
+_CONJUNCTIONS = {'': '', 'و': 'and ', 'ف': 'so '}
+_PREPOSITIONS = {'': '', 'ب': 'with ', 'ل': 'for '}
+_ARTICLE = 'the '
+
+def _proclitics():
+    table = {}
+    for conj, conj_en in _CONJUNCTIONS.items():
+        for prep, prep_en in _PREPOSITIONS.items():
+            table[conj + prep] = conj_en + prep_en
+            # ل + ال is written لل
+            article = 'ل' if prep == 'ل' else 'ال'
+            table[conj + prep + article] = conj_en + prep_en + _ARTICLE
+    del table['']
+    return table
+
+
+# e.g. 'وال' -> 'and the ', 'لل' -> 'for the '
+PROCLITICS = _proclitics()
+
+MAX_PROCLITIC = max(len(p) for p in PROCLITICS)
+
+
+def is_letter(ch):
+    return ch in ARABIC_LETTERS
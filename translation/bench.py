@@ -0,0 +1,282 @@
+"""Benchmark harness for the translation engines.
+
+Builds synthetic corpora from the real src/ tree (scaled in file count and
+in file size) and synthetic dictionaries of a given size, then measures
+every engine in a fresh interpreter: startup (dictionary load + compile),
+files/s, MB/s and peak RSS. Engines that have a legacy counterpart are
+checked byte for byte against it on the same corpus, so a speedup can
+never silently change the output.
+
+    python -m translation bench --scales 1,10 --dict-sizes 100,1000
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .arabic import ARABIC_WORD
+from .lexer import js_spans, translate_source
+from .matcher import Matcher
+from .store import DictionaryStore
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+SCRIPTS = ('translate.py', 'translate_arabic.py', 'translate_comprehensive.py')
+
+SOURCE_SUFFIXES = ('.js', '.jsx')
+
+
+def legacy_translate(translations, text):
+    """The original replace loop, kept as the reference implementation."""
+    for arabic, english in sorted(translations.items(), key=lambda x: len(x[0]), reverse=True):
+        text = text.replace(arabic, english)
+    return text
+
+
+def legacy_translate_spans(translations, text):
+    """The replace loop applied to each translatable span on its own."""
+    parts = []
+    pos = 0
+    for span in js_spans(text):
+        parts.append(text[pos:span.start])
+        parts.append(legacy_translate(translations, text[span.start:span.end]))
+        pos = span.end
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+def _prepare(engine, translations):
+    """Return text -> translated text for the named engine."""
+    if engine == 'replace-loop':
+        return lambda text: legacy_translate(translations, text)
+    if engine == 'replace-loop-spans':
+        return lambda text: legacy_translate_spans(translations, text)
+    if engine == 'matcher':
+        return Matcher(translations).translate
+    if engine == 'lexer':
+        matcher = Matcher(translations)
+        return lambda text: translate_source(matcher, text)
+    if engine == 'clitics':
+        matcher = Matcher(translations, clitics=True)
+        return lambda text: translate_source(matcher, text)
+    raise ValueError(f'unknown engine {engine!r}')
+
+
+ENGINES = ('replace-loop', 'replace-loop-spans', 'matcher', 'lexer', 'clitics')
+
+# engine -> the legacy engine its output must match byte for byte
+REFERENCES = {'matcher': 'replace-loop', 'lexer': 'replace-loop-spans'}
+
+
+def corpus_files(corpus_dir):
+    return sorted(p for p in Path(corpus_dir).rglob('*') if p.suffix in SOURCE_SUFFIXES)
+
+
+def build_corpus(src_dir, out_dir, count_scale=1, size_scale=1):
+    """Copy src_dir into out_dir/src with count_scale copies of every file,
+    each made of size_scale repetitions of the original content."""
+    src_dir = Path(src_dir)
+    target = Path(out_dir) / 'src'
+    for path in corpus_files(src_dir):
+        content = path.read_text(encoding='utf-8')
+        if size_scale > 1:
+            content = '\n'.join([content] * size_scale)
+        rel = path.relative_to(src_dir)
+        for copy in range(count_scale):
+            dest = target / (f'copy{copy}' if count_scale > 1 else '') / rel
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            dest.write_text(content, encoding='utf-8')
+    return target
+
+
+def synthetic_dictionary(base, corpus_texts, size, seed=0):
+    """A dictionary of exactly size entries: the real entries first, then
+    words and word pairs that occur in the corpus, then random Arabic words."""
+    rng = random.Random(seed)
+    entries = dict(list(base.items())[:size])
+    words = []
+    for text in corpus_texts:
+        found = ARABIC_WORD.findall(text)
+        words.extend(found)
+        words.extend(f'{a} {b}' for a, b in zip(found, found[1:]))
+    rng.shuffle(words)
+    letters = [chr(c) for c in range(0x0628, 0x064B)]
+    fill = iter(words)
+    while len(entries) < size:
+        key = next(fill, None)
+        if key is None:
+            key = ''.join(rng.choice(letters) for _ in range(rng.randint(3, 9)))
+        entries.setdefault(key, f'w{len(entries)}')
+    return entries
+
+
+def _measure(engine, corpus_dir, dict_path, queue):
+    """Child-process body: time one engine over one corpus."""
+    started = time.perf_counter()
+    with open(dict_path, encoding='utf-8') as f:
+        translations = json.load(f)
+    translate = _prepare(engine, translations)
+    startup = time.perf_counter() - started
+
+    files = corpus_files(corpus_dir)
+    total_bytes = 0
+    digests = []
+    t0 = time.perf_counter()
+    for path in files:
+        data = path.read_bytes()
+        total_bytes += len(data)
+        out = translate(data.decode('utf-8'))
+        digests.append(hashlib.sha256(out.encode('utf-8')).hexdigest())
+    elapsed = time.perf_counter() - t0
+
+    queue.put({
+        'engine': engine,
+        'files': len(files),
+        'bytes': total_bytes,
+        'startup_s': startup,
+        'elapsed_s': elapsed,
+        'files_per_s': len(files) / elapsed if elapsed else float('inf'),
+        'mb_per_s': total_bytes / 1e6 / elapsed if elapsed else float('inf'),
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'digests': digests,
+    })
+
+
+def run_engine(engine, corpus_dir, dict_path):
+    """Measure an engine in a freshly spawned interpreter (clean RSS and startup)."""
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(engine, str(corpus_dir), str(dict_path), queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def run_script(script, corpus_root):
+    """Wall time and peak RSS of one translate*.py run over corpus_root/src.
+
+    Runs with --force --dry-run so the corpus is never modified; startup is
+    the wall time of the same run over an empty src/.
+    """
+    def timed(cwd):
+        cmd = [sys.executable, str(REPO_ROOT / script), '--force', '--dry-run']
+        env = dict(os.environ, NEXUS_TRANSLATION_CACHE=str(Path(cwd) / '.translation-cache'))
+        t0 = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=subprocess.DEVNULL)
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        return time.perf_counter() - t0, usage.ru_maxrss / 1024
+
+    with tempfile.TemporaryDirectory() as empty:
+        (Path(empty) / 'src').mkdir()
+        startup, _ = timed(empty)
+    elapsed, rss = timed(corpus_root)
+    files = corpus_files(Path(corpus_root) / 'src')
+    total_bytes = sum(p.stat().st_size for p in files)
+    work = max(elapsed - startup, 1e-9)
+    return {
+        'engine': script,
+        'files': len(files),
+        'bytes': total_bytes,
+        'startup_s': startup,
+        'elapsed_s': elapsed,
+        'files_per_s': len(files) / work,
+        'mb_per_s': total_bytes / 1e6 / work,
+        'peak_rss_mb': rss,
+    }
+
+
+def _print_row(corpus, dict_size, r, check=''):
+    print(f"{corpus:<10} {dict_size:>6} {r['engine']:<28} {r['files']:>6} {r['bytes'] / 1e6:>8.2f} "
+          f"{r['startup_s'] * 1000:>9.1f} {r['files_per_s']:>9.1f} {r['mb_per_s']:>7.2f} "
+          f"{r['peak_rss_mb']:>7.1f}  {check}")
+
+
+def add_arguments(parser):
+    parser.add_argument('--src', type=Path, default=REPO_ROOT / 'src',
+                        help='tree the synthetic corpora are generated from')
+    parser.add_argument('--scales', default='1,10',
+                        help='comma-separated scale factors, applied to file count and to file size')
+    parser.add_argument('--dict-sizes', default='100,1000,10000',
+                        help='comma-separated synthetic dictionary sizes')
+    parser.add_argument('--engines', default=','.join(ENGINES),
+                        help=f'comma-separated engines ({", ".join(ENGINES)})')
+    parser.add_argument('--scripts', action='store_true',
+                        help='also time the translate*.py scripts end to end on each corpus')
+    parser.add_argument('--work-dir', type=Path,
+                        help='keep the generated corpora here instead of a temp dir')
+    parser.add_argument('--output', type=Path, help='write all results as JSON')
+    return parser
+
+
+def run(args):
+    """Run the benchmark matrix; returns 1 if any differential check failed."""
+    scales = [int(s) for s in args.scales.split(',') if s]
+    dict_sizes = [int(s) for s in args.dict_sizes.split(',') if s]
+    engines = [e for e in args.engines.split(',') if e]
+    for engine in engines:
+        if engine not in ENGINES:
+            raise SystemExit(f'unknown engine {engine!r}')
+    # References run alongside the engines they check
+    for engine in list(engines):
+        ref = REFERENCES.get(engine)
+        if ref and ref not in engines:
+            engines.insert(0, ref)
+
+    work = Path(args.work_dir or tempfile.mkdtemp(prefix='translation-bench-'))
+    base = DictionaryStore().translations()
+    results = []
+    failed = False
+    print(f"{'corpus':<10} {'dict':>6} {'engine':<28} {'files':>6} {'MB':>8} "
+          f"{'start ms':>9} {'files/s':>9} {'MB/s':>7} {'RSS MB':>7}  check")
+    try:
+        corpora = []
+        for scale in scales:
+            corpora.append((f'count{scale}x', scale, 1))
+            if scale > 1:
+                corpora.append((f'size{scale}x', 1, scale))
+        for name, count_scale, size_scale in corpora:
+            root = work / name
+            if not (root / 'src').exists():
+                build_corpus(args.src, root, count_scale, size_scale)
+            texts = [p.read_text(encoding='utf-8') for p in corpus_files(args.src)]
+            for size in dict_sizes:
+                dict_path = work / f'dict-{size}.json'
+                if not dict_path.exists():
+                    dict_path.write_text(json.dumps(synthetic_dictionary(base, texts, size), ensure_ascii=False),
+                                         encoding='utf-8')
+                by_engine = {}
+                for engine in engines:
+                    r = run_engine(engine, root / 'src', dict_path)
+                    by_engine[engine] = r
+                    check = ''
+                    ref = REFERENCES.get(engine)
+                    if ref in by_engine:
+                        bad = [str(p) for p, a, b in zip(corpus_files(root / 'src'), r['digests'],
+                                                         by_engine[ref]['digests']) if a != b]
+                        check = f'== {ref}' if not bad else f'MISMATCH vs {ref} in {len(bad)} file(s): {bad[0]}'
+                        failed = failed or bool(bad)
+                    _print_row(name, size, r, check)
+                    results.append(dict({k: v for k, v in r.items() if k != 'digests'},
+                                        corpus=name, dict_size=size, check=check))
+            if args.scripts:
+                for script in SCRIPTS:
+                    r = run_script(script, root)
+                    _print_row(name, len(base), r)
+                    results.append(dict(r, corpus=name, dict_size=len(base)))
+    finally:
+        if args.work_dir is None:
+            shutil.rmtree(work, ignore_errors=True)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 1 if failed else 0
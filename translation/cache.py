@@ -0,0 +1,62 @@
+"""Compile-once helpers and the on-disk cache of compiled matchers."""
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+
+from .fileio import atomic_write
+from .matcher import Matcher
+
+# Bump whenever the pickled Matcher layout changes
+FORMAT_VERSION = 3
+
+CACHE_DIR = Path(os.environ.get('NEXUS_TRANSLATION_CACHE', '.translation-cache'))
+
+_compiled = {}
+
+
+def dictionary_hash(translations):
+    """Stable hash of a translation dictionary (keys, values and order)."""
+    payload = json.dumps([FORMAT_VERSION, list(translations.items())], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def compile_matcher(translations, cache_dir=CACHE_DIR, clitics=False, whole_words=()):
+    """Return the compiled Matcher for translations.
+
+    Each dictionary is compiled at most once per process; across runs the
+    compiled automaton is loaded from cache_dir instead of being rebuilt.
+    """
+    digest = dictionary_hash(translations)
+    mode = '-clitics' if clitics else ''
+    if whole_words and not clitics:
+        mode = '-whole-' + dictionary_hash(dict.fromkeys(sorted(whole_words), ''))[:8]
+    matcher = _compiled.get(digest + mode)
+    if matcher is not None:
+        return matcher
+
+    cache_file = Path(cache_dir) / f'matcher-{digest[:32]}{mode}.pickle' if cache_dir else None
+    if cache_file is not None and cache_file.exists():
+        try:
+            with open(cache_file, 'rb') as f:
+                matcher = pickle.load(f)
+        except Exception:
+            matcher = None
+
+    if matcher is None:
+        matcher = Matcher(translations, clitics=clitics, whole_words=whole_words)
+        if cache_file is not None:
+            _save(matcher, cache_file)
+
+    _compiled[digest + mode] = matcher
+    return matcher
+
+
+def _save(matcher, cache_file):
+    """Write the pickle atomically; a missing cache is never an error."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(cache_file, pickle.dumps(matcher, protocol=pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        pass
@@ -0,0 +1,142 @@
+"""Bounded-memory translation of very large files, chunk by chunk.
+
+Generated bundles and data dumps can be hundreds of MB; reading one into a
+single str and building the translated copy next to it does not scale.
+ChunkedTranslator keeps a window of one chunk plus an overlap as long as
+the longest possible match. Each window is cut where no key occurrence
+(accepted or not) straddles the cut, at most an overlap before its end.
+Occurrences on either side of such a cut never compete, so everything
+before it is resolved exactly as in the whole text and is final; the rest
+is carried into the next window. Peak memory is O(chunk + longest key),
+unless chains of overlapping occurrences leave no such cut, in which case
+the window grows until one turns up.
+
+There are no spans in this mode: the whole text is matched, the way the
+old replace loop did, so it is meant for generated output rather than
+hand-written sources. With rule phases every phase gets its own
+translator, each feeding the next. Regex rules and normalization have no
+bound on the length of a match and cannot be streamed.
+"""
+from collections import Counter
+from functools import reduce
+
+from .arabic import MAX_PROCLITIC
+from .journal import compose_edits
+from .matcher import apply_matches
+from .memory import MemoryMatcher
+
+CHUNK_SIZE = 1 << 20
+
+# Text kept from before the window for the word-boundary checks of clitic mode
+CONTEXT = MAX_PROCLITIC + 1
+
+
+class ChunkedTranslator:
+    """feed() text chunks, close() at the end; output goes to write()."""
+
+    def __init__(self, matcher, write):
+        longest = matcher.longest_match
+        if longest is None:
+            raise ValueError('regex rules and normalization have no bound on a match and cannot be streamed')
+        self.matcher = matcher
+        self.write = write
+        # One more character for the word-boundary check of clitic mode
+        self.overlap = longest + 1
+        self.replacements = 0
+        self.entries = Counter()
+        # [offset, original, replacement] in the output (see journal.py)
+        self.edits = []
+        self.position = 0
+        self._buffer = ''
+        # The committed text right before the buffer (never rewritten)
+        self._context = ''
+        # Buffer length to wait for after a window without a cut
+        self._hold = 0
+
+    def feed(self, chunk):
+        self._buffer += chunk
+        if len(self._buffer) > max(2 * self.overlap, self._hold):
+            self._flush(final=False)
+
+    def close(self):
+        self._flush(final=True)
+
+    def _cut(self, text, start):
+        """The last offset of text, an overlap or more before its end, that no
+        key occurrence after start straddles."""
+        cut = len(text) - self.overlap
+        if cut <= start:
+            return start
+        # Only occurrences near the end can straddle; look further back only
+        # when overlapping ones push the cut that far
+        lo = max(start, cut - 2 * self.overlap)
+        found = self._free_offset(text, lo, cut)
+        if found - self.overlap < lo and lo > start:
+            found = self._free_offset(text, start, cut)
+        return found
+
+    def _free_offset(self, text, lo, cut):
+        """The last offset up to cut outside every occurrence starting at lo or later."""
+        # A clitic match can reach back over a proclitic in front of its key
+        reach = MAX_PROCLITIC if self.matcher.clitics else 0
+        blocked = []
+        for s, e in sorted((max(lo, s - reach), e) for _, s, e in self.matcher._candidates(text, lo)):
+            if blocked and s < blocked[-1][1]:
+                blocked[-1][1] = max(blocked[-1][1], e)
+            else:
+                blocked.append([s, e])
+        for s, e in reversed(blocked):
+            if e <= cut:
+                break
+            if s < cut:
+                return s
+        return cut
+
+    def _flush(self, final):
+        start = len(self._context)
+        text = self._context + self._buffer
+        cut = len(text) if final else self._cut(text, start)
+        if cut <= start:
+            # Occurrences overlap all the way through; wait for a longer window
+            self._hold = 2 * len(self._buffer)
+            return
+        self._hold = 0
+        committed = [m for m in self.matcher.matches(text) if m.start >= start and m.end <= cut]
+        delta = 0
+        for m in committed:
+            self.edits.append([self.position + m.start - start + delta, text[m.start:m.end], m.replacement])
+            delta += len(m.replacement) - (m.end - m.start)
+        self.replacements += len(committed)
+        self.entries.update(m.key for m in committed)
+        out = apply_matches(text[:cut], committed)[start:]
+        self.position += len(out)
+        self.write(out)
+        self._context = text[max(0, cut - CONTEXT):cut]
+        self._buffer = text[cut:]
+
+
+class ChunkedResult:
+    """What translate_chunked did, over all phases."""
+
+    def __init__(self, translators):
+        self.entries = sum((t.entries for t in translators), Counter())
+        self.edits = reduce(compose_edits, (t.edits for t in translators))
+        self.replacements = len(self.edits)
+
+
+def translate_chunked(src, dst, matcher, chunk_size=CHUNK_SIZE):
+    """Translate the text stream src into dst, chunk_size characters at a time."""
+    if isinstance(matcher, MemoryMatcher):
+        # Windows are not literals worth remembering
+        matcher = matcher.matcher
+    translators = []
+    write = dst.write
+    for phase in reversed(getattr(matcher, 'phases', [matcher])):
+        translators.insert(0, ChunkedTranslator(phase, write))
+        write = translators[0].feed
+    for chunk in iter(lambda: src.read(chunk_size), ''):
+        translators[0].feed(chunk)
+    # Each close() flushes into the next phase before that one closes
+    for translator in translators:
+        translator.close()
+    return ChunkedResult(translators)
@@ -0,0 +1,375 @@
+"""Command-line plumbing shared by the translate*.py scripts."""
+import sys
+from collections import deque
+from functools import partial
+from itertools import chain
+from pathlib import Path
+
+from .cache import dictionary_hash
+from .gitfiles import changed_since, staged_files, within
+from .journal import Journal, repair, undo_run
+from .locales import OUT_DIR, LocaleColumns, copy_other_files, locale_list, output_path
+from .manifest import MANIFEST_PATH, Manifest, track_file
+from .memory import TranslationMemory, memory_path
+from .pool import map_files
+from .scopes import scoped_matcher
+from .server import serve
+from .stats import STATS_PATH, Profiler, RunStats
+from .store import report_issues
+from .translator import Translator
+from .walk import DEFAULT_EXCLUDES, DEFAULT_EXTENSIONS, IgnoreRules, read_path_list, relative_path, walk
+from .watch import WatchTarget, watch
+
+# Seed data translated by --json when no files are given
+DATA_FILES = ('sample-data.json', 'firebase-enhanced-data.json', 'firebase-additional-data.json')
+
+
+def add_common_arguments(parser):
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help='files or directories to translate (default: src)')
+    parser.add_argument('--files-from', metavar='FILE',
+                        help="read more paths to translate from FILE, one per line ('-' for stdin)")
+    parser.add_argument('--ext', default=','.join(DEFAULT_EXTENSIONS),
+                        help='comma-separated extensions to pick up in directories, e.g. '
+                             f'.js,.jsx,.ts,.tsx,.html,.json (default: {",".join(DEFAULT_EXTENSIONS)})')
+    changes = parser.add_mutually_exclusive_group()
+    changes.add_argument('--since', metavar='REF',
+                         help='only look at the files git reports as changed since REF (a commit, '
+                              'branch or tag), staged or not')
+    changes.add_argument('--staged', action='store_true',
+                         help='only look at the files staged for the next commit')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help='.gitignore-style pattern to skip, on top of .gitignore and '
+                             f'{" ".join(DEFAULT_EXCLUDES)} (repeatable)')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='number of worker processes (0 = one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                        help='re-translate every file, ignoring the manifest')
+    parser.add_argument('--manifest', type=Path, default=MANIFEST_PATH,
+                        help=f'incremental-run manifest (default: {MANIFEST_PATH})')
+    parser.add_argument('--include-comments', action='store_true',
+                        help='also translate Arabic inside // and /* */ comments')
+    parser.add_argument('--clitics', action='store_true',
+                        help='match whole Arabic words only, allowing و/ف/ب/ل/ال in front')
+    parser.add_argument('--normalize', action='store_true',
+                        help='ignore tashkeel, tatweel and alef / ya spelling variants when matching')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='match every literal afresh instead of using the translation memory')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='print a unified diff of the replacements instead of writing files')
+    parser.add_argument('--locales', metavar='LIST',
+                        help='comma-separated target locales, e.g. en,fr: match every file once and '
+                             'write one translated tree per locale under --out-dir instead of '
+                             'translating in place')
+    parser.add_argument('--out-dir', type=Path, default=OUT_DIR,
+                        help=f'where --locales writes its trees (default: {OUT_DIR})')
+    parser.add_argument('--stream-above', type=_megabytes, metavar='MB',
+                        help='translate files of MB or more in bounded memory, chunk by chunk; '
+                             'the whole text is matched (as for generated bundles) and dry runs '
+                             'only count')
+    parser.add_argument('--counts', action='store_true',
+                        help='print how many replacements each dictionary entry made')
+    parser.add_argument('--json', action='store_true',
+                        help='translate string values of the JSON files given as paths instead of src/ '
+                             f'(default: {", ".join(DATA_FILES)})')
+    parser.add_argument('--stats', type=Path, metavar='FILE.json',
+                        help='write per-entry hit counts, per-file timings and never-matched entries '
+                             f'(with --profile alone: {STATS_PATH})')
+    parser.add_argument('--profile', action='store_true',
+                        help='run under cProfile and tracemalloc (single process) and dump the '
+                             'results next to the --stats file')
+    parser.add_argument('--watch', nargs='?', const='auto', choices=('auto', 'inotify', 'poll'),
+                        help='after the first pass keep running and translate files as they are '
+                             'saved (inotify, falling back to polling)')
+    parser.add_argument('--serve', action='store_true',
+                        help='keep the matcher loaded and answer JSON-lines requests on stdin/stdout '
+                             '(see translation/server.py)')
+    parser.add_argument('--undo', metavar='RUN_ID',
+                        help="revert the edits journaled by one run ('last' for the latest) and exit")
+    parser.add_argument('--repair', action='store_true',
+                        help='roll back the journaled edits that left words mixing Arabic and Latin '
+                             'letters and exit')
+    parser.add_argument('--validate', action='store_true',
+                        help='report conflicting, duplicate and unreachable dictionary keys, and keys that '
+                             'match inside longer words of the files, and exit')
+    return parser
+
+
+def start_run(parser, store, process_file, set_matcher, src_dir=Path('src'), argv=None):
+    """The part of main() every translate*.py script shares.
+
+    Parses the command line and runs the modes that do something else and
+    exit (--validate, --undo, --repair, --serve). Otherwise installs the
+    matcher for args with set_matcher() and starts the run: returns (args,
+    results), results yielding (file_path, result) as run_files() does.
+    process_file is the script's own, so pool workers import it from there.
+    """
+    args = add_common_arguments(parser).parse_args(argv)
+    if args.validate:
+        sys.exit(1 if report_issues(store, clitics=args.clitics, normalize=args.normalize,
+                                    files=collect_files(args, src_dir)) else 0)
+    if args.undo:
+        sys.exit(undo_run(args.undo))
+    if args.repair:
+        sys.exit(repair())
+    if args.serve:
+        sys.exit(serve(Translator(store, clitics=args.clitics, include_comments=args.include_comments,
+                                  normalize=args.normalize, memory=not args.no_memory)))
+
+    # Every JS and JSX file (or the JSON data files with --json)
+    files = collect_files(args, src_dir)
+    locales = locale_columns(args, store)
+    memory = load_memory(store, args)
+    matcher = scoped_matcher(store, clitics=args.clitics, normalize=args.normalize, memory=memory)
+    _install(set_matcher, matcher, locales)
+    if locales is not None:
+        print(f"Writing {', '.join(locales.coverage())} under {args.out_dir}")
+        if not args.dry_run and not args.json:
+            roots = list(args.paths) or [src_dir]
+            copied = copy_other_files(roots, extensions(args), ignore_rules(args), locales.locales, args.out_dir)
+            if copied:
+                print(f'Copied {copied} other files into the locale trees')
+    # The matcher and the locale columns reach pool workers through the
+    # initializer, once per process, instead of with every task
+    process = partial(_process_file, process_file, include_comments=args.include_comments, dry_run=args.dry_run,
+                      stream_above=args.stream_above, out_dir=args.out_dir)
+    results = run_files(files, process, store.translations(), engine_options(args, store, locales), args,
+                        _install, (set_matcher, matcher, locales), memory, src_dir)
+    return args, results
+
+
+# The LocaleColumns of the running --locales pass, installed by _install()
+_locales = None
+
+
+def _install(set_matcher, matcher, locales):
+    """Install the run's matcher (with the script's set_matcher) and locale columns."""
+    global _locales
+    set_matcher(matcher)
+    _locales = locales
+
+
+def _process_file(process_file, file_path, **options):
+    return process_file(file_path, locales=_locales, **options)
+
+
+def _megabytes(value):
+    return int(float(value) * (1 << 20))
+
+
+def engine_options(args, store, locales=None):
+    """Options that change the translated output (a change invalidates the manifest)."""
+    options = {'include_comments': args.include_comments, 'clitics': args.clitics, 'rules': store.rules_hash()}
+    scopes = store.scopes_hash()
+    if scopes is not None:
+        options['scopes'] = scopes
+    if args.normalize:
+        options['normalize'] = True
+    if args.stream_above is not None:
+        options['stream_above'] = args.stream_above
+    if locales is not None:
+        options['locales'] = locales.locales
+        options['out_dir'] = args.out_dir.as_posix()
+        options['columns'] = dictionary_hash(locales.columns)
+    return options
+
+
+def matching_options(args, store):
+    """The options that change which matches a literal gets."""
+    return {'clitics': args.clitics, 'normalize': args.normalize,
+            'rules': store.rules_hash(), 'scopes': store.scopes_hash()}
+
+
+def load_memory(store, args):
+    """The translation memory for store and args (None with --no-memory)."""
+    if args.no_memory:
+        return None
+    return TranslationMemory.load(memory_path(store.translations(), matching_options(args, store)))
+
+
+def locale_columns(args, store):
+    """The LocaleColumns of a --locales run (None without --locales)."""
+    if not args.locales:
+        return None
+    try:
+        return LocaleColumns(store, _locale_names(args), args.normalize)
+    except ValueError as e:
+        raise SystemExit(f'✗ --locales: {e}')
+
+
+def _locale_names(args):
+    return [locale.strip() for locale in args.locales.split(',') if locale.strip()]
+
+
+def _missing_output(args):
+    """Is a source file's copy missing from one of the --locales trees?"""
+    if not args.locales or args.dry_run:
+        return lambda file_path: False
+    locales = locale_list(_locale_names(args))
+    return lambda file_path: not all(output_path(args.out_dir, locale, file_path).exists() for locale in locales)
+
+
+def extensions(args):
+    return tuple(e if e.startswith('.') else '.' + e for e in args.ext.split(',') if e)
+
+
+def ignore_rules(args):
+    rules = IgnoreRules().add_file('.gitignore')
+    for pattern in args.exclude:
+        rules.add(pattern)
+    return rules
+
+
+def collect_files(args, src_dir):
+    """The files a run should look at, lazily and in a stable order."""
+    if args.json:
+        return list(args.paths) or [Path(p) for p in DATA_FILES]
+    if args.since or args.staged:
+        return changed_files(args, src_dir)
+    roots = list(args.paths)
+    if args.files_from:
+        roots.extend(read_path_list(args.files_from))
+    elif not roots:
+        roots = [src_dir]
+    return walk(roots, extensions(args), ignore_rules(args))
+
+
+def changed_files(args, src_dir):
+    """The files git reports for --since / --staged, under the given paths (or src_dir)."""
+    try:
+        candidates = changed_since(args.since) if args.since else staged_files()
+    except OSError as e:
+        raise SystemExit(f'✗ {e}')
+    roots = list(args.paths) or [src_dir]
+    suffixes = extensions(args)
+    rules = ignore_rules(args)
+    return [p for p in candidates
+            if p.name.endswith(suffixes) and within(p, roots) and not rules.excludes(p) and p.is_file()]
+
+
+def watch_target(args, src_dir):
+    """What --watch listens to: the walked directories, or just the named files."""
+    if args.json:
+        files = {p.resolve() for p in collect_files(args, src_dir)}
+        return WatchTarget({f.parent for f in files}, lambda p: p.resolve() in files, recursive=False)
+    roots = [Path(p) for p in args.paths] or [src_dir]
+    dirs = [p for p in roots if p.is_dir()]
+    if not dirs:
+        files = {p.resolve() for p in roots}
+        return WatchTarget({f.parent for f in files}, lambda p: p.resolve() in files, recursive=False)
+    suffixes = extensions(args)
+    rules = ignore_rules(args)
+    return WatchTarget(dirs, lambda p: p.name.endswith(suffixes) and not rules.excludes(p),
+                       skip_dir=lambda p: rules.ignored(relative_path(p), is_dir=True))
+
+
+def run_files(files, process_file, translations, options, args, initializer=None, initargs=(), memory=None,
+              src_dir=Path('src')):
+    """Yield (file_path, result) for every file, in order.
+
+    Files the manifest reports as unchanged since the last run are not
+    processed at all and come back with a result of None. Dry runs leave
+    the manifest alone since nothing is written. With --watch this goes on
+    yielding results for saved files until interrupted.
+    """
+    stats = profiler = None
+    journal = None if args.dry_run else Journal()
+    if args.stats or args.profile:
+        args.stats = args.stats or STATS_PATH
+        stats = RunStats(translations, options, args.jobs)
+    if args.profile:
+        # Workers would escape the profiler, so profile a single process
+        args.jobs = 1
+        profiler = Profiler(args.stats)
+        profiler.start()
+    try:
+        results = _run_files(files, process_file, translations, options, args, initializer, initargs)
+        if args.watch:
+            results = chain(results, _watch_files(process_file, translations, options, args, src_dir))
+        for file_path, result in results:
+            if stats is not None:
+                stats.add(result)
+            if journal is not None and result is not None:
+                journal.record(file_path, result.edits)
+            if memory is not None and result is not None and result.learned:
+                # From a worker; in-process runs have it already
+                memory.update(result.learned)
+            yield file_path, result
+    finally:
+        if memory is not None:
+            memory.save()
+        if journal is not None:
+            journal.close()
+            if journal.files:
+                print(f'Journaled run {journal.run_id} ({journal.files} files; '
+                      f'revert with --undo {journal.run_id})')
+        if profiler is not None:
+            profiler.stop()
+        if stats is not None:
+            stats.write(args.stats)
+            print(f'Wrote run statistics to {args.stats}' + (' (and profile dumps next to it)' if profiler else ''))
+
+
+def _run_files(files, process_file, translations, options, args, initializer, initargs):
+    manifest = Manifest.load(args.manifest, translations, options)
+    missing_output = _missing_output(args)
+    # Filled in as the walk is consumed: (file_path, needs processing)
+    order = deque()
+
+    def pending():
+        for file_path in files:
+            stale = args.force or not manifest.is_fresh(file_path) or missing_output(file_path)
+            order.append((file_path, stale))
+            if stale:
+                yield file_path
+
+    func = process_file if args.dry_run else partial(track_file, process_file)
+    try:
+        for result in map_files(func, pending(), args.jobs, initializer, initargs):
+            file_path, stale = order.popleft()
+            while not stale:
+                yield file_path, None
+                file_path, stale = order.popleft()
+            if not args.dry_run:
+                result, entry = result
+                manifest.record(file_path, entry)
+            yield file_path, result
+        while order:
+            yield order.popleft()[0], None
+    finally:
+        if not args.dry_run:
+            manifest.save()
+
+
+def _watch_files(process_file, translations, options, args, src_dir):
+    # Runs in this process: the matcher installed for the first pass stays
+    # in memory, and a single save is faster than a round trip to a pool
+    target = watch_target(args, src_dir)
+    print(f"Watching {', '.join(map(str, target.dirs))} for changes (Ctrl-C to stop)", flush=True)
+    if args.dry_run:
+        try:
+            yield from watch(target, process_file, args.watch)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    manifest = Manifest.load(args.manifest, translations, options)
+    try:
+        for file_path, (result, entry) in watch(target, partial(track_file, process_file),
+                                                args.watch, on_batch=manifest.save):
+            manifest.record(file_path, entry)
+            yield file_path, result
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manifest.save()
+
+
+def print_entry_counts(entry_counts):
+    """Per-entry replacement counts, most used first."""
+    if not entry_counts:
+        return
+    width = max(len(str(n)) for n in entry_counts.values())
+    print('\nReplacements per entry:')
+    for key, count in entry_counts.most_common():
+        print(f'  {count:>{width}}  {key}')
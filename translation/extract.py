@@ -0,0 +1,320 @@
+"""Extraction mode: move Arabic UI strings into per-locale message catalogs.
+
+Instead of rewriting Arabic literals to English in place, every literal
+that contains Arabic is replaced by a lookup, `$t('<chunk>.<hash>')`, and
+collected into src/i18n/locales/<chunk>/ar.json and en.json. The English
+side is filled in from the dictionary store. A chunk is the directory of the
+source file under src/ ('pages', 'components-instructor', ...), so a
+page only pulls in the catalog of its own directory, and only for the
+active language.
+
+    python -m translation extract --dry-run
+    python -m translation extract
+    python -m translation extract --langs en,fr
+
+With --langs every message is matched once and rendered into each
+language's catalog from the store's columns (see locales.py). A message is
+translated with the overlays of the first file it is extracted from (see
+scopes.py).
+
+Keys are content hashes, so the same string in one chunk is stored once
+and re-running the extraction never renumbers anything.
+
+The catalogs of the stored language are loaded by src/main.jsx before it
+imports the app, since literals at module level are looked up when their
+module is evaluated. Switching the language through the app's
+I18nProvider (src/i18n/i18nContext.jsx) stores it and reloads the page
+for the same reason. $t is also exposed through useTranslation().
+
+Service and config modules (DATA_EXCLUDES) are not extracted. Their
+literals are seed and Firebase data, which must not depend on the UI
+language; translate them in place with the translate*.py scripts.
+"""
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+from pathlib import Path
+
+from .arabic import ARABIC_WORD
+from .fileio import atomic_write, read_if_arabic
+from .lexer import js_spans
+from .locales import LocaleColumns
+from .matcher import apply_matches
+from .scopes import matcher_for, scoped_matcher
+from .store import DictionaryStore
+from .walk import IgnoreRules, walk
+
+SOURCE_SUFFIXES = ('.js', '.jsx')
+
+LOCALES_DIR = Path('src/i18n/locales')
+RUNTIME = 'messages.js'
+LOOKUP = '$t'
+KEY_LENGTH = 10
+
+# Seed and Firebase data live here; extracting it would make the stored
+# data depend on the UI language
+DATA_EXCLUDES = ('services/', 'config/')
+
+# Written once next to the locales directory; never overwritten
+RUNTIME_SOURCE = """\
+// Lookup for the catalogs written by `python -m translation extract`.
+// Each directory under ./locales is one chunk with an ar.json and en.json;
+// only the active language is fetched, one small file per chunk.
+//
+// Literals at module level are looked up when their module is evaluated,
+// so the catalogs have to be in before the app is imported: main.jsx
+// awaits loadExtracted() from ./i18nContext.jsx first. A failed load
+// leaves the keys showing rather than a blank page. I18nProvider's
+// changeLanguage() stores the new language and reloads the page for the
+// same reason, and useTranslation() hands out $t too.
+const catalogs = import.meta.glob('./locales/*/*.json', { import: 'default' });
+const CATALOG = /^\\.\\/locales\\/([^/]+)\\/([^/]+)\\.json$/;
+
+let messages = {};
+
+export async function loadMessages(lang, chunks = null) {
+  const loaded = {};
+  await Promise.all(Object.entries(catalogs).map(async ([path, load]) => {
+    const [, chunk, catalogLang] = path.match(CATALOG);
+    if (catalogLang === lang && (!chunks || chunks.includes(chunk))) {
+      loaded[chunk] = await load();
+    }
+  }));
+  messages = chunks ? { ...messages, ...loaded } : loaded;
+}
+
+export function $t(key) {
+  const dot = key.indexOf('.');
+  return messages[key.slice(0, dot)]?.[key.slice(dot + 1)] ?? key;
+}
+"""
+
+# One extracted literal: the source range it replaces and its lookup
+Extraction = namedtuple('Extraction', 'start end text replacement')
+
+_SIMPLE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+_ESCAPE = re.compile(r'\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|[\s\S])')
+_JSX_SPACE = re.compile(r'\s*\n\s*')
+
+
+def _unescape_match(m):
+    esc = m.group(1)
+    if esc[0] in 'ux' and len(esc) > 1:
+        return chr(int(esc.strip('u{}x'), 16))
+    if esc in ('\n', '\r\n', '\u2028', '\u2029'):
+        # Line continuation
+        return ''
+    return _SIMPLE_ESCAPES.get(esc, esc)
+
+
+def js_unescape(text):
+    """Runtime value of the body of a JS string or template literal."""
+    return _ESCAPE.sub(_unescape_match, text) if '\\' in text else text
+
+
+def chunk_name(file_path, src_dir):
+    """Catalog chunk of a source file: its directory under src/, '-'-joined."""
+    parts = Path(file_path).parent.relative_to(src_dir).parts
+    return '-'.join(parts).lower() if parts else 'app'
+
+
+def message_key(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:KEY_LENGTH]
+
+
+def _lookup(key):
+    return f"{LOOKUP}('{key}')"
+
+
+def _neighbours(text, start, end):
+    """Nearest non-space characters before start and after end."""
+    before = text[:start].rstrip()[-1:]
+    after = text[end:].lstrip()[:1]
+    return before, after
+
+
+def extractions(text, chunk):
+    """Extractions for every translatable literal of text that contains Arabic."""
+    found = []
+    for span in js_spans(text):
+        body = text[span.start:span.end]
+        if not ARABIC_WORD.search(body):
+            continue
+        if span.kind == 'string':
+            value = js_unescape(body)
+            start, end = span.start - 1, span.end + 1
+            replacement = _lookup(f'{chunk}.{message_key(value)}')
+            before, after = _neighbours(text, start, end)
+            if before in ('{', ',') and after == ':':
+                # An object key has to become a computed key
+                replacement = f'[{replacement}]'
+        elif span.kind == 'attr':
+            value = body
+            start, end = span.start - 1, span.end + 1
+            replacement = '{' + _lookup(f'{chunk}.{message_key(value)}') + '}'
+        else:
+            # Template text and JSX text keep their surrounding whitespace
+            stripped = body.strip()
+            start = span.start + (len(body) - len(body.lstrip()))
+            end = start + len(stripped)
+            if span.kind == 'template':
+                value = js_unescape(stripped)
+                replacement = '${' + _lookup(f'{chunk}.{message_key(value)}') + '}'
+            else:
+                value = _JSX_SPACE.sub(' ', stripped)
+                replacement = '{' + _lookup(f'{chunk}.{message_key(value)}') + '}'
+        found.append(Extraction(start, end, value, replacement))
+    return found
+
+
+def _import_line(file_path, runtime_path):
+    rel = os.path.relpath(runtime_path, Path(file_path).parent).replace(os.sep, '/')
+    if not rel.startswith('.'):
+        rel = './' + rel
+    return f"import {{ {LOOKUP} }} from '{rel}';\n"
+
+
+_IMPORT = re.compile(r'^import[\s{*][^;]*?[\'"][^\'"\n]+[\'"];?[ \t]*\n', re.M)
+
+
+def add_import(text, line):
+    """text with line inserted after its import statements."""
+    if line in text:
+        return text
+    pos = 0
+    for m in _IMPORT.finditer(text):
+        pos = m.end()
+    return text[:pos] + line + text[pos:]
+
+
+class Catalogs:
+    """ar catalogs and one per target language for each chunk, merged with
+    what is already on disk."""
+
+    def __init__(self, locales_dir, matcher, columns):
+        self.locales_dir = Path(locales_dir)
+        self.matcher = matcher
+        self.columns = columns
+        self.chunks = {}
+        self.untranslated = set()
+
+    def _chunk(self, chunk):
+        if chunk not in self.chunks:
+            catalogs = {}
+            for lang in ('ar', *self.columns.locales):
+                try:
+                    with open(self.locales_dir / chunk / f'{lang}.json', encoding='utf-8') as f:
+                        catalogs[lang] = json.load(f)
+                except (OSError, ValueError):
+                    catalogs[lang] = {}
+            self.chunks[chunk] = catalogs
+        return self.chunks[chunk]
+
+    def add(self, chunk, text, file_path=None):
+        key = message_key(text)
+        catalogs = self._chunk(chunk)
+        known = catalogs['ar'].get(key)
+        if known is not None and known != text:
+            raise ValueError(f'message key collision in {chunk}: {key}')
+        catalogs['ar'][key] = text
+        missing = [lang for lang in self.columns.locales if key not in catalogs[lang]]
+        if missing:
+            # One match pass, rendered for every language still lacking the message
+            matcher, overlays = matcher_for(self.matcher, file_path)
+            columns = self.columns.scoped(overlays)
+            matches = matcher.matches(text)
+            for lang in missing:
+                catalogs[lang][key] = apply_matches(
+                    text, [m._replace(replacement=columns.render(m, lang)) for m in matches])
+        if ARABIC_WORD.search(catalogs[self.columns.locales[0]][key]):
+            self.untranslated.add(f'{chunk}.{key}')
+        return key
+
+    def messages(self):
+        return sum(len(c['ar']) for c in self.chunks.values())
+
+    def save(self):
+        for chunk, catalogs in self.chunks.items():
+            for lang, messages in catalogs.items():
+                path = self.locales_dir / chunk / f'{lang}.json'
+                path.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write(path, json.dumps(messages, ensure_ascii=False, indent=2) + '\n')
+
+
+def extract_file(file_path, src_dir, catalogs, runtime_path, dry_run=False):
+    """Move the Arabic literals of one file into catalogs; returns how many."""
+    content = read_if_arabic(file_path)
+    if content is None:
+        return 0
+    chunk = chunk_name(file_path, src_dir)
+    found = extractions(content, chunk)
+    if not found:
+        return 0
+    parts = []
+    last = 0
+    for e in found:
+        catalogs.add(chunk, e.text, file_path)
+        parts.append(content[last:e.start])
+        parts.append(e.replacement)
+        last = e.end
+    parts.append(content[last:])
+    if not dry_run:
+        atomic_write(file_path, add_import(''.join(parts), _import_line(file_path, runtime_path)))
+    return len(found)
+
+
+def add_arguments(parser):
+    parser.add_argument('--src', type=Path, default=Path('src'),
+                        help='source tree to extract from (default: src)')
+    parser.add_argument('--locales', type=Path, default=LOCALES_DIR,
+                        help=f'catalog directory, one subdirectory per chunk (default: {LOCALES_DIR})')
+    parser.add_argument('--langs', default='en',
+                        help='comma-separated target languages to write catalogs for; en is always '
+                             'written (default: en)')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help='.gitignore-style pattern to skip, on top of .gitignore and '
+                             f'{" ".join(DATA_EXCLUDES)} (repeatable)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='report what would be extracted without writing anything')
+    return parser
+
+
+def run(args):
+    src_dir = args.src
+    runtime_path = args.locales.parent / RUNTIME
+    store = DictionaryStore()
+    try:
+        columns = LocaleColumns(store, [lang.strip() for lang in args.langs.split(',') if lang.strip()],
+                                args.normalize)
+    except ValueError as e:
+        print(f'✗ --langs: {e}')
+        return 2
+    catalogs = Catalogs(args.locales, scoped_matcher(store, clitics=args.clitics, normalize=args.normalize),
+                        columns)
+    ignore = IgnoreRules().add_file('.gitignore')
+    for pattern in DATA_EXCLUDES + tuple(args.exclude):
+        ignore.add(pattern)
+    files = walk([src_dir], SOURCE_SUFFIXES, ignore)
+    extracted = 0
+    for file_path in files:
+        try:
+            count = extract_file(file_path, src_dir, catalogs, runtime_path, args.dry_run)
+        except (OSError, ValueError) as e:
+            print(f'✗ {file_path}: {e}')
+            continue
+        if count:
+            print(f'✓ {file_path}: {count} strings')
+            extracted += count
+
+    if not args.dry_run:
+        catalogs.save()
+        if not runtime_path.exists():
+            atomic_write(runtime_path, RUNTIME_SOURCE)
+            print(f'Wrote {runtime_path}: src/main.jsx loads its catalogs before importing the app '
+                  f'(see its header)')
+    print(f'\n{extracted} strings, {catalogs.messages()} unique messages in {len(catalogs.chunks)} chunks')
+    if catalogs.untranslated:
+        print(f'{len(catalogs.untranslated)} messages still have Arabic in en.json')
+    return 0
@@ -0,0 +1,86 @@
+"""File access helpers: cheap Arabic prefilter and atomic writes."""
+import mmap
+import os
+import re
+import tempfile
+
+# In UTF-8 every character of the Arabic block U+0600-U+06FF starts with a
+# lead byte 0xD8-0xDB, and those bytes mean nothing else
+_ARABIC_LEAD = re.compile(rb'[\xd8-\xdb]')
+# JSON may also spell Arabic as \u06xx escapes
+_ARABIC_OR_ESCAPE = re.compile(rb'[\xd8-\xdb]|\\u06[0-9a-fA-F]{2}')
+
+
+def has_arabic(f, escapes=False):
+    """Scan the raw bytes of an open binary file for Arabic without decoding."""
+    if os.fstat(f.fileno()).st_size == 0:
+        return False
+    pattern = _ARABIC_OR_ESCAPE if escapes else _ARABIC_LEAD
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return pattern.search(mm) is not None
+
+
+def read_if_arabic(file_path):
+    """Decoded contents of file_path, or None when it holds no Arabic."""
+    with open(file_path, 'rb') as f:
+        if not has_arabic(f):
+            return None
+        return f.read().decode('utf-8')
+
+
+def atomic_write(path, data, encoding='utf-8'):
+    """Replace path with data via a temp file, so readers never see a partial file."""
+    if isinstance(data, str):
+        data = data.encode(encoding)
+    directory = os.path.dirname(os.fspath(path)) or '.'
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        try:
+            os.chmod(tmp, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class atomic_output:
+    """Text stream that replaces path when the with-block exits cleanly.
+
+    Call discard() to leave the original untouched (e.g. nothing changed).
+    """
+
+    def __init__(self, path, encoding='utf-8'):
+        self.path = path
+        self.encoding = encoding
+        self.keep = True
+
+    def __enter__(self):
+        directory = os.path.dirname(os.fspath(self.path)) or '.'
+        fd, self.tmp = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+        self.file = os.fdopen(fd, 'w', encoding=self.encoding, newline='')
+        return self
+
+    def write(self, text):
+        return self.file.write(text)
+
+    def discard(self):
+        self.keep = False
+
+    def __exit__(self, exc_type, exc, tb):
+        self.file.close()
+        if exc_type is None and self.keep:
+            try:
+                os.chmod(self.tmp, os.stat(self.path).st_mode & 0o7777)
+            except FileNotFoundError:
+                pass
+            os.replace(self.tmp, self.path)
+        else:
+            os.unlink(self.tmp)
+        return False
@@ -0,0 +1,196 @@
+"""Changed files from git: --since REF, --staged and the pre-commit hook.
+
+In CI and on commit only the files that changed matter, and walking all
+of src/ for them is most of the run. These modes ask the local git for the
+candidates instead (one `git diff` subprocess, no network):
+
+    python translate.py --since origin/main     # changed since REF, staged or not
+    python translate.py --staged                # what the next commit holds
+
+Only changes git knows about count: new files show up once they are
+added. The candidates still go through --ext, the exclusions and the
+paths given (src by default).
+
+The pre-commit entry point looks at the staged .js, .jsx and .json files
+under src/ (or the --src directories) only, never at the dictionaries
+themselves, e.g. as .git/hooks/pre-commit:
+
+    #!/bin/sh
+    exec python -m translation pre-commit --check
+
+or as a `repo: local` hook of the pre-commit framework, which passes the
+staged files as arguments (`entry: python -m translation pre-commit`,
+`language: system`, `files: \\.(jsx?|json)$`). With --check the staged
+content (the index, not the working tree) is checked and the hook fails
+if anything is left to translate. Without it the files are translated in
+place and journaled (--undo works) and re-staged. A file that also has
+unstaged changes is not re-staged, and the hook fails so that the
+translation can be reviewed and added by hand.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+from .journal import Journal
+from .store import DICTIONARY_DIR
+from .translator import Translator
+from .walk import IgnoreRules, relative_path
+
+HOOK_SUFFIXES = ('.js', '.jsx', '.json')
+
+HOOK_ROOTS = (Path('src'),)
+
+# The dictionary files are .json with Arabic in them, and are never translated
+DICTIONARY_EXCLUDE = 'translation/dictionaries/'
+
+
+def git(*args, stdin=None):
+    """stdout of one git command (bytes); OSError if git is missing or fails."""
+    try:
+        proc = subprocess.run(['git', *args], input=stdin, capture_output=True)
+    except FileNotFoundError:
+        raise OSError('git is not installed') from None
+    if proc.returncode:
+        message = proc.stderr.decode('utf-8', 'replace').strip() or f'exit status {proc.returncode}'
+        raise OSError(f'git {args[0]}: {message}')
+    return proc.stdout
+
+
+def _paths(output):
+    """The NUL-separated repository paths of output, relative to the working directory."""
+    names = [name for name in output.decode('utf-8').split('\0') if name]
+    if not names:
+        return []
+    top = Path(git('rev-parse', '--show-toplevel').decode('utf-8').rstrip('\n'))
+    return [Path(relative_path(top / name)) for name in names]
+
+
+def changed_since(ref):
+    """Files added, copied, modified or renamed since ref, staged or not."""
+    return _paths(git('diff', '--name-only', '-z', '--diff-filter=ACMR', ref, '--'))
+
+
+def staged_files():
+    """Files the next commit adds, copies, modifies or renames."""
+    return _paths(git('diff', '--cached', '--name-only', '-z', '--diff-filter=ACMR', '--'))
+
+
+def unstaged_files():
+    """Files whose working-tree content differs from the index."""
+    return _paths(git('diff', '--name-only', '-z', '--'))
+
+
+def staged_contents(paths):
+    """{path: staged bytes} for paths, read in one `git cat-file` call."""
+    paths = list(paths)
+    if not paths:
+        return {}
+    # Index paths are relative to the top level, ':./' makes them relative to here
+    request = ''.join(f':./{Path(p).as_posix()}\n' for p in paths).encode('utf-8')
+    output = git('cat-file', '--batch', stdin=request)
+    contents = {}
+    pos = 0
+    for path in paths:
+        header_end = output.index(b'\n', pos)
+        header = output[pos:header_end].split()
+        if header[-1] == b'missing':
+            pos = header_end + 1
+            continue
+        size = int(header[2])
+        contents[path] = output[header_end + 1:header_end + 1 + size]
+        pos = header_end + 1 + size + 1
+    return contents
+
+
+def within(path, roots):
+    """Is path one of roots or under one of them?"""
+    path = Path(relative_path(path))
+    return any(path == root or root in path.parents for root in (Path(relative_path(r)) for r in roots))
+
+
+def add_arguments(parser):
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help='files to look at (default: the staged .js/.jsx/.json files)')
+    parser.add_argument('--src', action='append', type=Path, metavar='DIR',
+                        help='only look at files under DIR (repeatable, default: src)')
+    parser.add_argument('--check', action='store_true',
+                        help='only check the staged content and fail if anything is left to translate')
+    parser.add_argument('--include-comments', action='store_true',
+                        help='also translate Arabic inside // and /* */ comments')
+    return parser
+
+
+def run(args, out=sys.stdout):
+    """The pre-commit hook; returns an exit status."""
+    ignore = IgnoreRules().add_file('.gitignore')
+    ignore.add(DICTIONARY_EXCLUDE)
+    roots = args.src or HOOK_ROOTS
+    try:
+        candidates = args.paths or staged_files()
+    except OSError as e:
+        print(f'✗ {e}', file=out)
+        return 1
+    files = [p for p in candidates if p.name.endswith(HOOK_SUFFIXES) and within(p, roots)
+             and not within(p, [DICTIONARY_DIR]) and not ignore.excludes(p)]
+    if not files:
+        return 0
+    translator = Translator(clitics=args.clitics, include_comments=args.include_comments,
+                            normalize=args.normalize)
+    try:
+        if args.check:
+            return _check(translator, files, out)
+        return _translate(translator, files, out)
+    except OSError as e:
+        print(f'✗ {e}', file=out)
+        return 1
+    finally:
+        translator.save_memory()
+
+
+def _check(translator, files, out):
+    pending = 0
+    for path, data in staged_contents(files).items():
+        try:
+            result = translator.translate(data, path=path)
+        except (UnicodeDecodeError, ValueError) as e:
+            print(f'✗ {path}: {e}', file=out)
+            pending += 1
+            continue
+        if result.matches:
+            print(f'✗ {path}: {len(result.matches)} strings left to translate', file=out)
+            pending += 1
+    if pending:
+        print(f'{pending} staged files need translating (run python -m translation pre-commit)', file=out)
+    return 1 if pending else 0
+
+
+def _translate(translator, files, out):
+    unstaged = set(unstaged_files())
+    journal = Journal()
+    translated = []
+    failed = 0
+    try:
+        for path in files:
+            try:
+                result, edits = translator.translate_path(path, write=True)
+            except (OSError, UnicodeDecodeError, ValueError) as e:
+                print(f'✗ {path}: {e}', file=out)
+                failed += 1
+                continue
+            if edits:
+                journal.record(path, edits)
+                translated.append(path)
+                print(f'✓ Translated: {path} ({len(result.matches)} replacements)', file=out)
+    finally:
+        journal.close()
+    restage = [p for p in translated if p not in unstaged]
+    if restage:
+        git('add', '--', *map(str, restage))
+    kept = [p for p in translated if p in unstaged]
+    for path in kept:
+        print(f'✗ {path}: has unstaged changes, so the translation was not staged; review and add it',
+              file=out)
+    if journal.files:
+        print(f'Journaled run {journal.run_id} ({journal.files} files; '
+              f'revert with --undo {journal.run_id})', file=out)
+    return 1 if kept or failed else 0
@@ -0,0 +1,288 @@
+"""Replacement journal: what every run changed, so it can be taken back.
+
+Each run that writes files appends one line per file to
+.translation-cache/journal/<run id>.jsonl with the edits it made, as
+[offset, original, replacement] triples (offsets are characters in the file
+as written). That is enough to:
+
+- undo a run: put the originals back at their offsets, touching only the
+  files the run changed and checking every span before reverting it;
+- repair corruption: find tokens that mix Arabic and Latin letters (a
+  short key replaced inside a word, e.g. 'أandNoً') and revert just the
+  edits that produced them.
+"""
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from .cache import CACHE_DIR
+from .fileio import atomic_write
+
+JOURNAL_DIR = CACHE_DIR / 'journal'
+
+# Journals of older runs are pruned when a new run starts
+KEEP_RUNS = 20
+
+_SUFFIX = '.jsonl'
+_UNDONE = '.undone'
+
+# A token of letters that holds both Arabic and Latin ones
+_TOKEN = re.compile(r'[A-Za-zء-ٟٮ-ۓۺ-ۿ]+')
+_LATIN = re.compile(r'[A-Za-z]')
+_ARABIC = re.compile(r'[ء-ٟٮ-ۓۺ-ۿ]')
+
+
+def journal_edits(text, matches):
+    """[offset, original, replacement] for matches, offsets in the output text."""
+    edits = []
+    delta = 0
+    for m in matches:
+        edits.append([m.start + delta, text[m.start:m.end], m.replacement])
+        delta += len(m.replacement) - (m.end - m.start)
+    return edits
+
+
+def compose_edits(first, second):
+    """One edit list for two passes made one after the other.
+
+    first turned T0 into T1 and second turned T1 into T2; edits of the two
+    that overlap in T1 are merged into one edit of T0 into T2.
+    """
+    # Everything as spans of T1: first by its replacement, second by its original
+    items = [(off, off + len(repl), 0, orig, repl) for off, orig, repl in first]
+    shift = 0
+    for off, orig, repl in second:
+        items.append((off - shift, off - shift + len(orig), 1, orig, repl))
+        shift += len(repl) - len(orig)
+    items.sort(key=lambda item: item[:3])
+
+    out = []
+    shift = 0   # T2 offset minus T1 offset before the group
+    i = 0
+    while i < len(items):
+        group_start, group_end = items[i][0], items[i][1]
+        group = [items[i]]
+        i += 1
+        while i < len(items) and items[i][0] < group_end:
+            group_end = max(group_end, items[i][1])
+            group.append(items[i])
+            i += 1
+        # The group's T1 text, pieced together from both passes
+        middle = [''] * (group_end - group_start)
+        for start, end, later, orig, repl in group:
+            middle[start - group_start:end - group_start] = orig if later else repl
+        middle = ''.join(middle)
+        before = _replace_spans(middle, [(s - group_start, e - group_start, orig)
+                                         for s, e, later, orig, _ in group if not later])
+        after = _replace_spans(middle, [(s - group_start, e - group_start, repl)
+                                        for s, e, later, _, repl in group if later])
+        out.append([group_start + shift, before, after])
+        shift += len(after) - len(middle)
+    return out
+
+
+def _replace_spans(text, spans):
+    parts = []
+    pos = 0
+    for start, end, replacement in spans:
+        parts.append(text[pos:start])
+        parts.append(replacement)
+        pos = end
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+def revert_edits(text, edits):
+    """Put the originals of edits back.
+
+    Returns (text, reverted, skipped): an edit whose replacement is no longer
+    at its offset (the file changed since) is skipped.
+    """
+    parts = []
+    pos = 0
+    reverted, skipped = [], []
+    # A deletion and the edit right after it share an offset; the deletion
+    # (empty replacement) comes first, otherwise the journal's order holds
+    for edit in sorted(edits, key=lambda e: (e[0], len(e[2]))):
+        offset, original, replacement = edit
+        if offset < pos or text[offset:offset + len(replacement)] != replacement:
+            skipped.append(edit)
+            continue
+        parts.append(text[pos:offset])
+        parts.append(original)
+        pos = offset + len(replacement)
+        reverted.append(edit)
+    parts.append(text[pos:])
+    return ''.join(parts), reverted, skipped
+
+
+def _shift(edits, reverted):
+    """Offsets of the remaining edits once reverted ones are undone."""
+    changes = sorted((off, len(orig) - len(repl)) for off, orig, repl in reverted)
+    out = []
+    for off, orig, repl in edits:
+        delta = sum(d for o, d in changes if o < off)
+        out.append([off + delta, orig, repl])
+    return out
+
+
+def mixed_tokens(text):
+    """(start, end) of the tokens mixing Arabic and Latin letters."""
+    return [m.span() for m in _TOKEN.finditer(text)
+            if _LATIN.search(m.group()) and _ARABIC.search(m.group())]
+
+
+def new_run_id():
+    return time.strftime('%Y%m%d-%H%M%S') + '-' + os.urandom(2).hex()
+
+
+class Journal:
+    """Append-only journal of one run; the file is created on the first record."""
+
+    def __init__(self, directory=JOURNAL_DIR, run_id=None):
+        self.directory = Path(directory)
+        self.run_id = run_id or new_run_id()
+        self.path = self.directory / f'{self.run_id}{_SUFFIX}'
+        self.files = 0
+        self._f = None
+
+    def record(self, file_path, edits):
+        if not edits:
+            return
+        if self._f is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            _prune(self.directory, KEEP_RUNS - 1)
+            self._f = open(self.path, 'a', encoding='utf-8')
+        self._f.write(json.dumps({'path': Path(file_path).as_posix(), 'edits': edits}, ensure_ascii=False) + '\n')
+        self._f.flush()
+        self.files += 1
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+
+def _prune(directory, keep):
+    runs = sorted(directory.glob(f'*{_SUFFIX}*'))
+    for path in runs[:max(0, len(runs) - keep)]:
+        path.unlink()
+
+
+def runs(directory=JOURNAL_DIR):
+    """Run ids that can still be undone, oldest first."""
+    return sorted(p.name[:-len(_SUFFIX)] for p in Path(directory).glob(f'*{_SUFFIX}'))
+
+
+def load_run(run_id, directory=JOURNAL_DIR):
+    """The records of one run, in the order they were written."""
+    if run_id == 'last':
+        available = runs(directory)
+        if not available:
+            raise FileNotFoundError('no journaled runs')
+        run_id = available[-1]
+    path = Path(directory) / f'{run_id}{_SUFFIX}'
+    with open(path, encoding='utf-8') as f:
+        return path, [json.loads(line) for line in f if line.strip()]
+
+
+def _save_run(path, records):
+    atomic_write(path, ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records))
+
+
+def undo_run(run_id, directory=JOURNAL_DIR, out=sys.stdout):
+    """Revert the edits of one run; returns an exit status."""
+    try:
+        path, records = load_run(run_id, directory)
+    except (OSError, ValueError) as e:
+        print(f'✗ Cannot read run {run_id}: {e}', file=out)
+        return 1
+    failed = 0
+    # Later records of the same file (watch mode) were made on top of the
+    # earlier ones, so go backwards
+    for record in reversed(records):
+        file_path = record['path']
+        try:
+            with open(file_path, encoding='utf-8', newline='') as f:
+                text = f.read()
+            text, reverted, skipped = revert_edits(text, record['edits'])
+            if reverted:
+                atomic_write(file_path, text)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f'✗ {file_path}: {e}', file=out)
+            failed += 1
+            continue
+        note = f', {len(skipped)} changed since and kept' if skipped else ''
+        print(f'↶ {file_path}: {len(reverted)} edits reverted{note}', file=out)
+        failed += bool(skipped)
+    path.rename(path.with_name(path.name + _UNDONE))
+    print(f'Undid run {path.name[:-len(_SUFFIX)]}', file=out)
+    return 1 if failed else 0
+
+
+def repair_file(text, edits):
+    """Revert the edits that touch a mixed Arabic/Latin token, until none do.
+
+    Returns (text, reverted, remaining) with the remaining edits' offsets
+    adjusted to the new text.
+    """
+    reverted_all = []
+    while True:
+        tokens = mixed_tokens(text)
+        culprits = [e for e in edits
+                    if any(e[0] < end and start < e[0] + len(e[2]) for start, end in tokens)]
+        if not culprits:
+            return text, reverted_all, edits
+        text, reverted, _ = revert_edits(text, culprits)
+        if not reverted:
+            return text, reverted_all, edits
+        reverted_all.extend(reverted)
+        done = {id(e) for e in reverted}
+        edits = _shift([e for e in edits if id(e) not in done], reverted)
+
+
+def repair(directory=JOURNAL_DIR, out=sys.stdout):
+    """Roll back the journaled edits behind mixed-script tokens; returns an exit status."""
+    seen = set()
+    originals = Counter()
+    repaired = 0
+    # A file's newest record is the one whose offsets match it now
+    for run_id in reversed(runs(directory)):
+        path, records = load_run(run_id, directory)
+        changed = False
+        for record in reversed(records):
+            file_path = record['path']
+            if file_path in seen:
+                continue
+            seen.add(file_path)
+            try:
+                with open(file_path, encoding='utf-8', newline='') as f:
+                    text = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                print(f'✗ {file_path}: {e}', file=out)
+                continue
+            if revert_edits(text, record['edits'])[2]:
+                print(f'✗ {file_path}: changed since run {run_id}, not repaired', file=out)
+                continue
+            text, reverted, remaining = repair_file(text, record['edits'])
+            if not reverted:
+                continue
+            atomic_write(file_path, text)
+            record['edits'] = remaining
+            changed = True
+            repaired += 1
+            originals.update(orig for _, orig, _ in reverted)
+            print(f'✓ {file_path}: {len(reverted)} edits rolled back', file=out)
+        if changed:
+            _save_run(path, [r for r in records if r['edits']])
+
+    print(f'Repaired {repaired} files', file=out)
+    if originals:
+        # The entries that keep producing these are the ones to fix
+        print('Rolled back most often: ' + ', '.join(f'{k!r} ×{n}' for k, n in originals.most_common(10)),
+              file=out)
+    return 0
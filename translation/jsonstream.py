@@ -0,0 +1,145 @@
+"""Streaming translation of JSON string values (never keys).
+
+The document is read in fixed-size chunks and written out as it goes, so
+memory stays bounded by the longest single string no matter how large the
+Firebase export is. Everything except translated string values is copied
+through byte for byte, formatting included.
+"""
+import json
+import re
+from collections import Counter
+
+from .arabic import ARABIC_OR_ESCAPE
+from .matcher import Match, apply_matches
+
+CHUNK_SIZE = 1 << 16
+
+_STRUCTURAL = re.compile(r'["{}\[\],:]')
+_STRING_STOP = re.compile(r'["\\]')
+
+
+class JSONTranslator:
+    """Incremental JSON scanner; feed() text chunks, output goes to write()."""
+
+    def __init__(self, matcher, write):
+        self.matcher = matcher
+        self._write = write
+        self.replacements = 0
+        self.entries = Counter()
+        # [offset, original, replacement] per translated string, offsets in
+        # the output (see journal.py)
+        self.edits = []
+        self.position = 0
+        # Match records over the input, one per translated string; only
+        # collected when set to a list (json_matches)
+        self.matches = None
+        self._shift = 0
+        self._stack = []
+        self._expect_key = False
+        self._in_string = False
+        self._escape = False
+        self._token = []
+
+    def write(self, text):
+        self.position += len(text)
+        self._write(text)
+
+    def feed(self, chunk):
+        i = 0
+        n = len(chunk)
+        while i < n:
+            if self._in_string:
+                if self._escape:
+                    self._token.append(chunk[i])
+                    self._escape = False
+                    i += 1
+                    continue
+                m = _STRING_STOP.search(chunk, i)
+                if m is None:
+                    self._token.append(chunk[i:])
+                    return
+                j = m.end()
+                self._token.append(chunk[i:j])
+                i = j
+                if m.group() == '\\':
+                    self._escape = True
+                else:
+                    self._in_string = False
+                    self._string(''.join(self._token))
+                continue
+
+            m = _STRUCTURAL.search(chunk, i)
+            if m is None:
+                self.write(chunk[i:])
+                return
+            j = m.start()
+            if j > i:
+                self.write(chunk[i:j])
+            ch = chunk[j]
+            i = j + 1
+            if ch == '"':
+                self._in_string = True
+                self._token = ['"']
+                continue
+            self.write(ch)
+            if ch == '{':
+                self._stack.append(ch)
+                self._expect_key = True
+            elif ch == '[':
+                self._stack.append(ch)
+                self._expect_key = False
+            elif ch in '}]':
+                if self._stack:
+                    self._stack.pop()
+                self._expect_key = False
+            elif ch == ',':
+                self._expect_key = bool(self._stack) and self._stack[-1] == '{'
+            else:
+                self._expect_key = False
+
+    def close(self):
+        if self._in_string:
+            # Truncated document: pass the unterminated string through
+            self.write(''.join(self._token))
+            self._in_string = False
+
+    def _string(self, raw):
+        if self._expect_key or not ARABIC_OR_ESCAPE.search(raw):
+            self.write(raw)
+            return
+        value = json.loads(raw)
+        matches = self.matcher.matches(value)
+        if not matches:
+            self.write(raw)
+            return
+        self.replacements += len(matches)
+        self.entries.update(m.key for m in matches)
+        translated = json.dumps(apply_matches(value, matches), ensure_ascii=False)
+        self.edits.append([self.position, raw, translated])
+        if self.matches is not None:
+            start = self.position - self._shift
+            self.matches.append(Match(start, start + len(raw), ' + '.join(m.key for m in matches), translated))
+        self._shift += len(translated) - len(raw)
+        self.write(translated)
+
+
+def translate_json_stream(src, dst, matcher, chunk_size=CHUNK_SIZE):
+    """Translate the JSON text stream src into dst; returns the JSONTranslator."""
+    translator = JSONTranslator(matcher, dst.write)
+    for chunk in iter(lambda: src.read(chunk_size), ''):
+        translator.feed(chunk)
+    translator.close()
+    return translator
+
+
+def json_matches(matcher, text):
+    """Match records for the string values of an in-memory JSON document.
+
+    Each translated string is one match over its quoted token, keyed by
+    the dictionary keys it used joined with ' + '.
+    """
+    translator = JSONTranslator(matcher, lambda text: None)
+    translator.matches = []
+    translator.feed(text)
+    translator.close()
+    return translator.matches
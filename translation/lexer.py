@@ -0,0 +1,301 @@
+"""Streaming JS/JSX lexer that yields only the spans worth translating.
+
+Only string literals, template-literal text, JSX text and JSX attribute
+strings are reported (plus comments on request); html_spans does the same
+for the text and attribute values of an HTML page such as index.html. Imports, identifiers and
+the rest of the code are never handed to the matcher, so a dictionary key
+can no longer rewrite part of an identifier or break the syntax.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache, partial
+
+from .matcher import apply_matches
+
+# kind is one of 'string', 'template', 'jsx', 'attr', 'comment'; quote is the
+# delimiter for 'string' and 'attr' spans
+Span = namedtuple('Span', 'start end kind quote')
+
+# After these keywords an expression starts, so '/' begins a regex and '<'
+# begins a JSX element
+_EXPR_KEYWORDS = frozenset((
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+    'void', 'throw', 'yield', 'await', 'instanceof', 'default',
+))
+_EXPR_CHARS = frozenset('([{},;:=!&|?+-*%<>~^/')
+_SPACE = ' \t\r\n\f\v\xa0\ufeff'
+
+# Characters where something interesting can start; everything in between
+# is skipped with a single regex search
+_CODE_STOP = re.compile(r'[\'"`/<{}]')
+_STRING_STOP = {q: re.compile(r'[\\\n%s]' % q) for q in '\'"'}
+_TEMPLATE_STOP = re.compile(r'[\\`]|\$\{')
+_JSX_TAG_STOP = re.compile(r'/>|[>"\'{]')
+_JSX_TEXT_STOP = re.compile(r'[{<]')
+
+
+def _is_word(ch):
+    return ch.isalnum() or ch in '_$'
+
+
+class _Lexer:
+
+    def __init__(self, text, include_comments):
+        self.text = text
+        self.n = len(text)
+        self.include_comments = include_comments
+
+    def _expression_before(self, i):
+        """True if an expression (so a regex or JSX) may start at i."""
+        text = self.text
+        k = i - 1
+        while k >= 0 and text[k] in _SPACE:
+            k -= 1
+        if k < 0:
+            return True
+        ch = text[k]
+        if _is_word(ch):
+            j = k
+            while j > 0 and _is_word(text[j - 1]):
+                j -= 1
+            return text[j:k + 1] in _EXPR_KEYWORDS
+        return ch in _EXPR_CHARS
+
+    def _code(self, i, nested):
+        """Plain JS. When nested, stop after the '}' closing a ${...} or {...}."""
+        text, n = self.text, self.n
+        depth = 0
+        while i < n:
+            m = _CODE_STOP.search(text, i)
+            if m is None:
+                return n
+            i = m.start()
+            ch = text[i]
+            nxt = text[i + 1] if i + 1 < n else ''
+            if ch == '/' and nxt == '/':
+                end = text.find('\n', i)
+                end = n if end == -1 else end
+                if self.include_comments:
+                    yield Span(i + 2, end, 'comment', '')
+                i = end
+            elif ch == '/' and nxt == '*':
+                end = text.find('*/', i + 2)
+                stop = n if end == -1 else end
+                if self.include_comments:
+                    yield Span(i + 2, stop, 'comment', '')
+                i = n if end == -1 else end + 2
+            elif ch == '"' or ch == "'":
+                (start, stop), i = self._string_end(i)
+                yield Span(start, stop, 'string', ch)
+            elif ch == '`':
+                i = yield from self._template(i + 1)
+            elif ch == '/':
+                i = self._regex_end(i) if self._expression_before(i) else i + 1
+            elif ch == '<':
+                if (nxt.isalpha() or nxt == '>') and self._expression_before(i):
+                    i = yield from self._jsx_element(i)
+                else:
+                    i += 1
+            elif ch == '{':
+                depth += 1
+                i += 1
+            else:
+                if not depth and nested:
+                    return i + 1
+                depth -= 1
+                i += 1
+        return n
+
+    def _string_end(self, i):
+        """((content_start, content_end), next_pos) for the literal opening at i."""
+        text, n = self.text, self.n
+        stop = _STRING_STOP[text[i]]
+        j = i + 1
+        while True:
+            m = stop.search(text, j)
+            if m is None:
+                return (i + 1, n), n
+            j = m.start()
+            ch = text[j]
+            if ch == '\\':
+                j += 2
+            elif ch == '\n':
+                # Unterminated literal: stop at the end of the line
+                return (i + 1, j), j
+            else:
+                return (i + 1, j), j + 1
+
+    def _template(self, i):
+        text, n = self.text, self.n
+        start = i
+        while True:
+            m = _TEMPLATE_STOP.search(text, i)
+            if m is None:
+                yield Span(start, n, 'template', '`')
+                return n
+            i = m.start()
+            tok = m.group()
+            if tok == '\\':
+                i += 2
+            elif tok == '`':
+                yield Span(start, i, 'template', '`')
+                return i + 1
+            else:
+                yield Span(start, i, 'template', '`')
+                i = yield from self._code(i + 2, nested=True)
+                start = i
+
+    def _regex_end(self, i):
+        text, n = self.text, self.n
+        j = i + 1
+        in_class = False
+        while j < n:
+            ch = text[j]
+            if ch == '\\':
+                j += 2
+                continue
+            if ch == '\n':
+                # Not a regex after all, just a division
+                return i + 1
+            if ch == '[':
+                in_class = True
+            elif ch == ']':
+                in_class = False
+            elif ch == '/' and not in_class:
+                j += 1
+                while j < n and _is_word(text[j]):
+                    j += 1
+                return j
+            j += 1
+        return i + 1
+
+    def _jsx_element(self, i):
+        i, self_closing = yield from self._jsx_tag(i)
+        if self_closing:
+            return i
+        return (yield from self._jsx_children(i))
+
+    def _jsx_tag(self, i):
+        """Opening tag at i; returns (next_pos, self_closing)."""
+        text, n = self.text, self.n
+        i += 1
+        while True:
+            m = _JSX_TAG_STOP.search(text, i)
+            if m is None:
+                return n, True
+            i = m.start()
+            tok = m.group()
+            if tok == '/>':
+                return i + 2, True
+            if tok == '>':
+                return i + 1, False
+            if tok == '{':
+                i = yield from self._code(i + 1, nested=True)
+            else:
+                end = text.find(tok, i + 1)
+                end = n if end == -1 else end
+                yield Span(i + 1, end, 'attr', tok)
+                i = end + 1
+
+    def _jsx_children(self, i):
+        text, n = self.text, self.n
+        start = i
+        while True:
+            m = _JSX_TEXT_STOP.search(text, i)
+            if m is None:
+                if n > start:
+                    yield Span(start, n, 'jsx', '')
+                return n
+            i = m.start()
+            if i > start:
+                yield Span(start, i, 'jsx', '')
+            if text[i] == '{':
+                i = yield from self._code(i + 1, nested=True)
+            elif i + 1 < n and text[i + 1] == '/':
+                end = text.find('>', i)
+                return n if end == -1 else end + 1
+            else:
+                i = yield from self._jsx_element(i)
+            start = i
+
+
+def js_spans(text, include_comments=False):
+    """Yield the translatable Spans of a JS/JSX source, in order."""
+    yield from _Lexer(text, include_comments)._code(0, nested=False)
+
+
+_HTML_SKIP = re.compile(r'<!--.*?-->|<(script|style)\b.*?</\1\s*>', re.S | re.I)
+_HTML_TAG_STOP = re.compile(r'[>"\']')
+
+
+def html_spans(text):
+    """Yield the text nodes and quoted attribute values of an HTML document.
+
+    Comments and <script>/<style> elements are skipped whole. Text nodes
+    are reported as 'jsx' spans, which escape the same way.
+    """
+    n = len(text)
+    i = 0
+    while i < n:
+        lt = text.find('<', i)
+        stop = n if lt == -1 else lt
+        if stop > i:
+            yield Span(i, stop, 'jsx', '')
+        if lt == -1:
+            return
+        m = _HTML_SKIP.match(text, lt)
+        if m:
+            i = m.end()
+            continue
+        i = lt + 1
+        while True:
+            m = _HTML_TAG_STOP.search(text, i)
+            if m is None:
+                return
+            if m.group() == '>':
+                i = m.end()
+                break
+            quote = m.group()
+            end = text.find(quote, m.end())
+            end = n if end == -1 else end
+            yield Span(m.end(), end, 'attr', quote)
+            i = end + 1
+
+
+def escape(replacement, span):
+    """Make replacement safe to drop into the given kind of span."""
+    kind = span.kind
+    if kind == 'string':
+        return replacement.replace('\\', '\\\\').replace(span.quote, '\\' + span.quote).replace('\n', '\\n')
+    if kind == 'template':
+        return replacement.replace('\\', '\\\\').replace('`', '\\`').replace('${', '\\${')
+    if kind == 'attr':
+        return replacement.replace(span.quote, '&quot;' if span.quote == '"' else '&apos;')
+    if kind == 'jsx':
+        return (replacement.replace('{', '&#123;').replace('}', '&#125;')
+                .replace('<', '&lt;').replace('>', '&gt;'))
+    if kind == 'comment':
+        return replacement.replace('*/', '* /')
+    return replacement
+
+
+@lru_cache(maxsize=None)
+def escaper(kind, quote):
+    """escape() for one kind of span; key tells escapers apart (see memory.py)."""
+    func = partial(escape, span=Span(0, 0, kind, quote))
+    func.key = (kind, quote)
+    return func
+
+
+def source_matches(matcher, text, include_comments=False, html=False):
+    """Matches inside the translatable spans, replacements escaped for their span."""
+    found = []
+    spans = html_spans(text) if html else js_spans(text, include_comments)
+    for span in spans:
+        found.extend(matcher.matches(text, span.start, span.end, escaper(span.kind, span.quote)))
+    return found
+
+
+def translate_source(matcher, text, include_comments=False, html=False):
+    """Translate only the translatable spans of a JS/JSX (or HTML) source."""
+    return apply_matches(text, source_matches(matcher, text, include_comments, html))
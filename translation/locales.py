@@ -0,0 +1,113 @@
+"""One match pass, many target locales.
+
+The matcher is built from the English column of the dictionary store and
+finds the same keys whatever the target language, so a multi-locale run
+matches every span once and renders the match records once per locale:
+English keeps the matcher's replacement, any other locale takes the
+entry's column for that locale. Matches without a column of their own
+(rule phases, merged matches, entries nobody has translated yet) keep
+the English replacement, so an output never holds less than the English
+build. Files with overlays (see scopes.py) render from the columns
+merged over those overlays.
+
+Each tree is complete: the run copies every other file under the walked
+directories (stylesheets, assets, JSON) into it as it is, and a source
+file whose copy is missing from a tree is translated again.
+
+In clitic mode a matched proclitic (و، ب، ال...) is only spelled out in
+English; other locales get the bare translation of the word.
+"""
+import os
+import shutil
+from pathlib import Path
+
+from .lexer import escaper, html_spans, js_spans
+from .normalize import normalize_keys
+from .store import PRIMARY_LOCALE
+from .walk import relative_path, walk
+
+# Where --locales writes its trees, one per locale (skipped by the walker)
+OUT_DIR = Path('build/locales')
+
+
+class LocaleColumns:
+    """The dictionary columns a multi-locale run renders, primary first."""
+
+    def __init__(self, store, locales, normalize=False, overlays=()):
+        self.store = store
+        self.normalize = normalize
+        self.locales = locale_list(locales)
+        unknown = [locale for locale in self.locales if locale not in store.locales()]
+        if unknown:
+            # It would only be a copy of the English tree
+            raise ValueError(f'no dictionary entry has a column for {", ".join(unknown)} '
+                             f'(available: {", ".join(store.locales())})')
+        self.columns = {}
+        for locale in self.locales[1:]:
+            column = store.translations(locale, overlays)
+            self.columns[locale] = normalize_keys(column) if normalize else column
+        self.entries = len(store.translations(overlays=overlays))
+        self._scoped = {overlays: self}
+
+    def scoped(self, overlays):
+        """The columns with overlays stacked on, built on first use."""
+        if overlays not in self._scoped:
+            self._scoped[overlays] = LocaleColumns(self.store, self.locales, self.normalize, overlays)
+        return self._scoped[overlays]
+
+    def render(self, match, locale):
+        """The (unescaped) replacement for match in locale."""
+        column = self.columns.get(locale)
+        if column is None:
+            return match.replacement
+        return column.get(match.key, match.replacement)
+
+    def coverage(self):
+        """One line per locale: how many entries it has a column for."""
+        return [f'{locale}: {self.entries if locale == PRIMARY_LOCALE else len(self.columns[locale])} '
+                f'of {self.entries} entries' for locale in self.locales]
+
+
+def locale_list(locales):
+    """The locales a run writes: the primary one first, each once."""
+    return list(dict.fromkeys([PRIMARY_LOCALE, *locales]))
+
+
+def localized_matches(matcher, text, columns, include_comments=False, html=False):
+    """{locale: matches} for the translatable spans of text, from one match pass."""
+    out = {locale: [] for locale in columns.locales}
+    spans = html_spans(text) if html else js_spans(text, include_comments)
+    for span in spans:
+        found = matcher.matches(text, span.start, span.end)
+        if not found:
+            continue
+        escape = escaper(span.kind, span.quote)
+        for locale, matches in out.items():
+            matches.extend(m._replace(replacement=escape(columns.render(m, locale))) for m in found)
+    return out
+
+
+def output_path(out_dir, locale, file_path):
+    """Where the locale's copy of file_path goes: out_dir/<locale>/<path>."""
+    return Path(out_dir) / locale / relative_path(file_path).lstrip('/')
+
+
+def copy_other_files(roots, suffixes, ignore, locales, out_dir):
+    """Copy the files under roots without one of suffixes into every locale
+    tree, skipping copies that are up to date; returns how many were copied."""
+    copied = 0
+    for path in walk([r for r in roots if Path(r).is_dir()], ('',), ignore):
+        if path.name.endswith(suffixes):
+            continue
+        st = os.stat(path)
+        for locale in locales:
+            target = output_path(out_dir, locale, path)
+            try:
+                current = os.stat(target)
+                if current.st_size == st.st_size and current.st_mtime_ns >= st.st_mtime_ns:
+                    continue
+            except FileNotFoundError:
+                target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, target)
+            copied += 1
+    return copied
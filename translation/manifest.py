@@ -0,0 +1,135 @@
+"""Content-hash manifest used to skip files that are already up to date."""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from .arabic import ARABIC_WORD
+from .cache import CACHE_DIR, dictionary_hash
+from .fileio import atomic_write
+from .normalize import normalize
+
+MANIFEST_PATH = CACHE_DIR / 'manifest.json'
+
+MANIFEST_VERSION = 1
+
+
+def entry_fingerprint(key, value):
+    """Short hash identifying one dictionary entry."""
+    return hashlib.sha1(f'{key}\0{value}'.encode('utf-8')).hexdigest()[:16]
+
+
+def file_entry(file_path):
+    """Manifest record for the current state of file_path, or None if unreadable."""
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+            st = os.fstat(f.fileno())
+        text = data.decode('utf-8')
+    except (OSError, UnicodeDecodeError):
+        return None
+    return {
+        'mtime_ns': st.st_mtime_ns,
+        'size': st.st_size,
+        'sha256': hashlib.sha256(data).hexdigest(),
+        # Arabic left in the file; lets a dictionary edit invalidate only the
+        # files that could contain the edited key
+        'words': sorted(set(ARABIC_WORD.findall(text))),
+    }
+
+
+def track_file(process_file, file_path):
+    """Run process_file and capture the file's manifest record (worker side)."""
+    result = process_file(file_path)
+    return result, file_entry(file_path)
+
+
+def _could_contain(words, key):
+    """Conservative check: can a file with these Arabic words contain key?"""
+    return all(any(part in word for word in words) for part in ARABIC_WORD.findall(key))
+
+
+class Manifest:
+    """Per-file mtime/size/hash records plus the dictionary they were built with."""
+
+    def __init__(self, path, translations, options=None):
+        self.path = Path(path)
+        self.options = options or {}
+        self.dictionary = dictionary_hash(translations)
+        self.entries = sorted({entry_fingerprint(k, v) for k, v in translations.items()})
+        self.files = {}
+        self.invalidated = 0
+        self._load(translations)
+
+    @classmethod
+    def load(cls, path, translations, options=None):
+        return cls(path, translations, options)
+
+    def _load(self, translations):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != MANIFEST_VERSION or data.get('options', {}) != self.options:
+            return
+        files = data.get('files', {})
+        if data.get('dictionary') != self.dictionary:
+            # Only added or edited entries can change a file that was already
+            # translated: every key it contained has been replaced since
+            known = set(data.get('entries', []))
+            changed = [k for k, v in translations.items() if entry_fingerprint(k, v) not in known]
+            # Normalized keys match every spelling of themselves, so compare
+            # the words the matcher will see
+            fold = normalize if self.options.get('normalize') else None
+            if fold:
+                changed = [fold(k) for k in changed]
+            for name in list(files):
+                words = files[name].get('words', [])
+                if fold:
+                    words = [fold(w) for w in words]
+                if any(_could_contain(words, key) for key in changed):
+                    del files[name]
+                    self.invalidated += 1
+        self.files = files
+
+    def is_fresh(self, file_path):
+        """True when the file is unchanged since it was last translated."""
+        entry = self.files.get(Path(file_path).as_posix())
+        if entry is None:
+            return False
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return False
+        if st.st_size != entry['size']:
+            return False
+        if st.st_mtime_ns == entry['mtime_ns']:
+            return True
+        # Touched but maybe not modified (checkout, copy): compare contents
+        with open(file_path, 'rb') as f:
+            if hashlib.sha256(f.read()).hexdigest() != entry['sha256']:
+                return False
+        entry['mtime_ns'] = st.st_mtime_ns
+        return True
+
+    def record(self, file_path, entry):
+        name = Path(file_path).as_posix()
+        if entry is None:
+            self.files.pop(name, None)
+        else:
+            self.files[name] = entry
+
+    def save(self):
+        data = {
+            'version': MANIFEST_VERSION,
+            'options': self.options,
+            'dictionary': self.dictionary,
+            'entries': self.entries,
+            'files': self.files,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.path, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+        except OSError:
+            pass
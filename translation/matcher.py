@@ -0,0 +1,200 @@
+"""Single-pass multi-pattern matcher for the translation dictionaries."""
+import re
+from collections import deque, namedtuple
+
+from .arabic import ARABIC_LETTERS, MAX_PROCLITIC, PROCLITICS
+
+# A resolved replacement: text[start:end] == prefix + key is replaced by
+# replacement (prefix is a proclitic, only ever set in clitic mode)
+Match = namedtuple('Match', 'start end key replacement prefix', defaults=('',))
+
+
+class Matcher:
+    """Aho-Corasick automaton over the dictionary keys.
+
+    Overlapping matches are resolved the same way the old replace loop did:
+    longer keys win, ties go to the key that comes first in the dictionary,
+    and occurrences of the same key are taken left to right.
+
+    With clitics=True keys only match whole Arabic words, optionally behind
+    a proclitic chain (و، ف، ب، ل، ال). The proclitic's English is put in
+    front of the replacement, so 'والكورسات' becomes 'and the courses' from
+    the single entry 'كورسات', and 'و' no longer matches inside words.
+    Entries that are just a proclitic plus another entry are dropped from
+    the automaton since they are matched anyway.
+
+    Without clitics, the keys in whole_words still only match whole
+    words, just without proclitics: 'تم' stays out of 'يتم'.
+    """
+
+    def __init__(self, translations, clitics=False, whole_words=()):
+        self.clitics = clitics
+        # Same priority order as sorted(..., key=len, reverse=True)
+        items = sorted(translations.items(), key=lambda x: len(x[0]), reverse=True)
+        if clitics:
+            items = _drop_derivable(items)
+        self.keys = [key for key, _ in items if key]
+        self.values = [value for key, value in items if key]
+        whole_words = set(whole_words)
+        self.whole = frozenset(i for i, key in enumerate(self.keys) if key in whole_words and not clitics)
+        self._build()
+
+    def _build(self):
+        goto = [{}]
+        out = [[]]
+        for key_id, key in enumerate(self.keys):
+            state = 0
+            for ch in key:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(key_id)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+        self._lengths = [len(key) for key in self.keys]
+        first = ''.join(sorted(goto[0]))
+        self._skip = re.compile('[%s]' % re.escape(first)) if first else None
+
+    @property
+    def longest_match(self):
+        """Upper bound on the length of a single match."""
+        longest = max(self._lengths, default=0)
+        return longest + MAX_PROCLITIC if self.clitics else longest
+
+    def _candidates(self, text, start=0, end=None):
+        """Yield (key_id, start, end) for every key occurrence in text[start:end]."""
+        if self._skip is None:
+            return
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        skip = self._skip
+        state = 0
+        i = start
+        n = len(text) if end is None else end
+        while i < n:
+            if not state:
+                # Jump straight to the next character that can start a key
+                m = skip.search(text, i, n)
+                if m is None:
+                    return
+                i = m.start()
+            ch = text[i]
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            i += 1
+            for key_id in out[state]:
+                yield key_id, i - lengths[key_id], i
+
+    def matches(self, text, start=0, end=None, escape=None):
+        """Return the non-overlapping matches in text[start:end], in text order.
+
+        escape, if given, is applied to every replacement (see lexer.escape).
+        """
+        if self._skip is None or not self._skip.search(text, start, len(text) if end is None else end):
+            return []
+        candidates = sorted(self._candidates(text, start, end))
+        if not candidates:
+            return []
+        stop = len(text) if end is None else end
+        taken = bytearray(stop - start)
+        accepted = []
+        whole = self.whole
+        for key_id, m_start, m_end in candidates:
+            prefix = ''
+            if self.clitics:
+                word_start = self._word_start(text, m_start, m_end, start, stop)
+                if word_start is None:
+                    continue
+                prefix = text[word_start:m_start]
+                m_start = word_start
+            elif whole and key_id in whole and self._inside_word(text, m_start, m_end, start, stop):
+                continue
+            lo, hi = m_start - start, m_end - start
+            if taken.find(1, lo, hi) != -1:
+                continue
+            taken[lo:hi] = b'\x01' * (hi - lo)
+            value = self.values[key_id]
+            if prefix:
+                accepted.append(Match(m_start, m_end, self.keys[key_id], PROCLITICS[prefix] + value, prefix))
+            else:
+                accepted.append(Match(m_start, m_end, self.keys[key_id], value))
+        accepted.sort()
+        if escape is not None:
+            for i, m in enumerate(accepted):
+                replacement = escape(m.replacement)
+                if replacement != m.replacement:
+                    accepted[i] = m._replace(replacement=replacement)
+        return accepted
+
+    @staticmethod
+    def _word_start(text, m_start, m_end, start, stop):
+        """Start of the word holding text[m_start:m_end], or None if it is not
+        a whole word behind an optional proclitic chain."""
+        if m_end < stop and text[m_end - 1] in ARABIC_LETTERS and text[m_end] in ARABIC_LETTERS:
+            return None
+        if text[m_start] not in ARABIC_LETTERS:
+            return m_start
+        word_start = m_start
+        limit = max(start, m_start - MAX_PROCLITIC)
+        while word_start > limit and text[word_start - 1] in ARABIC_LETTERS:
+            word_start -= 1
+        if word_start > start and text[word_start - 1] in ARABIC_LETTERS:
+            return None
+        if word_start != m_start and text[word_start:m_start] not in PROCLITICS:
+            return None
+        return word_start
+
+    @staticmethod
+    def _inside_word(text, m_start, m_end, start, stop):
+        """Does text[m_start:m_end] run into Arabic letters on either side?"""
+        return ((m_start > start and text[m_start] in ARABIC_LETTERS and text[m_start - 1] in ARABIC_LETTERS)
+                or (m_end < stop and text[m_end - 1] in ARABIC_LETTERS and text[m_end] in ARABIC_LETTERS))
+
+    def translate(self, text):
+        """Replace every dictionary key in text and build the result once."""
+        return apply_matches(text, self.matches(text))
+
+def apply_matches(text, matches):
+    """Build the translated text from matches sorted by position."""
+    if not matches:
+        return text
+    parts = []
+    pos = 0
+    for m in matches:
+        parts.append(text[pos:m.start])
+        parts.append(m.replacement)
+        pos = m.end
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+def _drop_derivable(items):
+    """Drop entries equal to a proclitic plus another entry (clitic mode)."""
+    table = dict(items)
+    kept = []
+    for key, value in items:
+        for prefix, english in PROCLITICS.items():
+            stem = key[len(prefix):]
+            if key.startswith(prefix) and stem in table and english + table[stem] == value:
+                break
+        else:
+            kept.append((key, value))
+    return kept
@@ -0,0 +1,144 @@
+"""Translation memory: whole literals mapped to their matches, kept between runs.
+
+The same labels ('جاري التحميل', 'خطأ في تحميل البيانات', button text)
+turn up in dozens of components, and every span used to be matched from
+scratch. MemoryMatcher wraps the compiled matcher and remembers the
+match records of each literal it sees, relative to the literal and keyed
+on how its replacements were escaped and on the overlays (scopes.py) of
+the matcher that found them. A literal seen before costs one
+dictionary lookup.
+
+The memory is a bounded LRU. It is stored under .translation-cache/ in a
+file named after the dictionary hash and the options that change matches,
+so editing the dictionaries or rules starts a fresh one. Pool workers get
+the parent's memory with the matcher and send back what they learned in
+FileResult.learned; the parent merges it and saves the memory at the end
+of the run.
+"""
+import hashlib
+import json
+import pickle
+from collections import OrderedDict
+
+from .arabic import ARABIC_WORD
+from .cache import CACHE_DIR, dictionary_hash
+from .fileio import atomic_write
+from .matcher import Match, apply_matches
+
+# Literals remembered at most; about 100 bytes each on disk
+MEMORY_SIZE = 50_000
+
+# Longer texts (whole files in stream mode, big JSON values) are not literals
+MAX_LITERAL = 2_000
+
+# Memories of other dictionaries kept around (e.g. with and without --clitics)
+KEEP_MEMORIES = 4
+
+
+def memory_path(translations, options, cache_dir=CACHE_DIR):
+    """Where the memory for this dictionary and these matching options lives."""
+    payload = json.dumps([dictionary_hash(translations), options], sort_keys=True)
+    return cache_dir / f'memory-{hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]}.pickle'
+
+
+class TranslationMemory:
+    """LRU of (overlays, escape key, literal) -> match tuples relative to the literal."""
+
+    def __init__(self, capacity=MEMORY_SIZE, path=None):
+        self.capacity = capacity
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        found = self.entries.get(key)
+        if found is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return found
+
+    def put(self, key, matches):
+        self.entries[key] = matches
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def update(self, learned):
+        for key, matches in learned.items():
+            self.put(key, matches)
+
+    @classmethod
+    def load(cls, path, capacity=MEMORY_SIZE):
+        """The memory saved at path; a missing or unreadable file is an empty memory."""
+        memory = cls(capacity, path)
+        try:
+            with open(path, 'rb') as f:
+                memory.update(dict(pickle.load(f)))
+        except Exception:
+            pass
+        return memory
+
+    def save(self, path=None):
+        path = path or self.path
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(path, pickle.dumps(list(self.entries.items()), protocol=pickle.HIGHEST_PROTOCOL))
+            others = sorted((p for p in path.parent.glob('memory-*.pickle') if p != path),
+                            key=lambda p: p.stat().st_mtime)
+            for old in others[:max(0, len(others) - (KEEP_MEMORIES - 1))]:
+                old.unlink()
+        except OSError:
+            pass
+
+
+class MemoryMatcher:
+    """A matcher that looks every literal up in a TranslationMemory first.
+
+    Everything but matches() is the wrapped matcher's.
+    """
+
+    def __init__(self, matcher, memory, overlays=()):
+        self.matcher = matcher
+        self.memory = memory
+        self.overlays = overlays
+        # Entries added since take_learned() was last called
+        self.learned = {}
+
+    def __getattr__(self, name):
+        return getattr(self.matcher, name)
+
+    def __getstate__(self):
+        return self.__dict__
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def matches(self, text, start=0, end=None, escape=None):
+        end = len(text) if end is None else end
+        escape_key = getattr(escape, 'key', None) if escape is not None else ()
+        if (escape_key is None or end - start > MAX_LITERAL
+                or not ARABIC_WORD.search(text, start, end)):
+            return self.matcher.matches(text, start, end, escape)
+        literal = text[start:end]
+        key = (self.overlays, escape_key, literal)
+        found = self.memory.get(key)
+        if found is None:
+            found = tuple(tuple(m) for m in self.matcher.matches(literal, escape=escape))
+            self.memory.put(key, found)
+            self.learned[key] = found
+        return [Match(s + start, e + start, k, r, p) for s, e, k, r, p in found]
+
+    def translate(self, text):
+        return apply_matches(text, self.matches(text))
+
+    def take_learned(self):
+        learned, self.learned = self.learned, {}
+        return learned
+
+
+def take_learned(matcher):
+    """What a MemoryMatcher learned since the last call, or None."""
+    return matcher.take_learned() if isinstance(matcher, MemoryMatcher) else None
@@ -0,0 +1,96 @@
+"""Arabic orthographic normalization, with offsets back to the source.
+
+'مرحباً' and 'مرحبا', 'إدارة' and 'ادارة', 'مـــرحبا' and 'مرحبا' are one
+word to a reader but three strings to the matcher. With normalization the
+dictionary keys are normalized once when the matcher is compiled, and each
+text span is matched through a normalized view of it:
+
+- tashkeel (U+064B-U+065F), the superscript alef and tatweel are dropped;
+- alef variants (أ إ آ ٱ) become ا, and alef maqsura (ى) becomes ي.
+
+Folding a letter keeps every offset, so only the dropped characters need
+an entry in the OffsetMap. A match in the view is mapped back onto the
+original span, marks included, and the original text is rewritten there.
+
+Folding also merges words that differ only in those letters: 'على' then
+matches the name 'علي' too. Use it with --clitics, since substring matching
+finds many more false hits in normalized text.
+"""
+import re
+from bisect import bisect_right
+
+from .matcher import apply_matches
+
+_DROPPED = [*range(0x064B, 0x0660), 0x0670, 0x0640]
+_MARKS = re.compile('[%s]+' % ''.join(map(chr, _DROPPED)))
+_FOLDED = {'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا', 'ى': 'ي'}
+_TABLE = str.maketrans({**_FOLDED, **dict.fromkeys(map(chr, _DROPPED))})
+
+
+def normalize(text):
+    return text.translate(_TABLE)
+
+
+def normalize_keys(translations):
+    """translations keyed by normalized keys.
+
+    Of several spellings of one key the first entry wins, like any other
+    duplicate; validate(normalize=True) reports them.
+    """
+    normalized = {}
+    for key, value in translations.items():
+        normalized.setdefault(normalize(key), value)
+    return normalized
+
+
+class OffsetMap:
+    """Offsets in a normalized text mapped back to the text it came from.
+
+    Only the runs of dropped characters are stored: points[j] is the
+    normalized offset right after the j-th run and shifts[j] the number of
+    characters dropped up to there.
+    """
+
+    __slots__ = ('points', 'shifts')
+
+    def __init__(self, text):
+        self.points = []
+        self.shifts = []
+        dropped = 0
+        for m in _MARKS.finditer(text):
+            dropped += m.end() - m.start()
+            self.points.append(m.end() - dropped)
+            self.shifts.append(dropped)
+
+    def original(self, offset):
+        """The original offset; marks after a letter go with that letter."""
+        j = bisect_right(self.points, offset) - 1
+        return offset + self.shifts[j] if j >= 0 else offset
+
+
+class NormalizedMatcher:
+    """A Matcher compiled from normalize_keys(), matched on normalized views."""
+
+    # Any number of marks or tatweel can sit inside one match
+    longest_match = None
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.clitics = matcher.clitics
+
+    def matches(self, text, start=0, end=None, escape=None):
+        """Matches in text[start:end] in original offsets; keys are normalized."""
+        end = len(text) if end is None else end
+        span = text[start:end]
+        view = span.translate(_TABLE)
+        found = self.matcher.matches(view, escape=escape)
+        if not found:
+            return []
+        if len(view) == len(span):
+            return [m._replace(start=start + m.start, end=start + m.end) for m in found]
+        offsets = OffsetMap(span)
+        return [m._replace(start=start + offsets.original(m.start), end=start + offsets.original(m.end))
+                for m in found]
+
+    def translate(self, text):
+        return apply_matches(text, self.matches(text))
@@ -0,0 +1,254 @@
+"""Per-file translation step shared by the scripts and the pool workers."""
+import os
+import time
+from collections import Counter, namedtuple
+
+from .chunked import translate_chunked
+from .fileio import atomic_output, atomic_write, has_arabic, read_if_arabic
+from .journal import journal_edits
+from .locales import localized_matches, output_path
+from .jsonstream import translate_json_stream
+from .lexer import source_matches
+from .matcher import apply_matches
+from .memory import take_learned
+from .scopes import matcher_for
+
+TRANSLATED = 'translated'
+NO_ARABIC = 'no-arabic'
+UNCHANGED = 'unchanged'
+ERROR = 'error'
+
+# entries counts replacements per dictionary key; diff is only set on dry
+# runs; timings holds the seconds spent in 'read', 'match' and 'write';
+# edits are the journal records of what was written; learned holds the
+# translation-memory entries the file added (see memory.py)
+FileResult = namedtuple('FileResult', 'path status replacements entries diff error size timings edits learned',
+                        defaults=(0, None, None, None, 0, None, None, None))
+
+
+class _Clock:
+    """Splits one file's wall time into read / match / write phases."""
+
+    def __init__(self):
+        self.timings = {'read': 0.0, 'match': 0.0, 'write': 0.0}
+        self._last = time.perf_counter()
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.timings[phase] += now - self._last
+        self._last = now
+
+
+def translate_file(file_path, matcher, include_comments=False, dry_run=False, stream_above=None,
+                   locales=None, out_dir=None):
+    """Translate one JS/JSX/HTML file in place (or only diff it on a dry run).
+
+    .json files are streamed instead: only string values are translated.
+    Files of stream_above bytes or more are translated in chunks (see
+    chunked.py). With locales (LocaleColumns) the file is left alone and
+    one copy per locale is written under out_dir. A ScopedMatcher is
+    narrowed to the matcher of the file's scopes first (see scopes.py).
+    """
+    matcher, overlays = matcher_for(matcher, file_path)
+    if locales is not None:
+        return translate_file_locales(file_path, matcher, locales.scoped(overlays), out_dir,
+                                      include_comments, dry_run)
+    if str(file_path).endswith('.json'):
+        return translate_json_file(file_path, matcher, dry_run)
+    clock = _Clock()
+    size = 0
+    try:
+        size = os.stat(file_path).st_size
+        if stream_above is not None and size >= stream_above:
+            return translate_chunked_file(file_path, matcher, dry_run)
+        # Most files have no Arabic left after the first pass; find that out
+        # from the raw bytes without decoding them
+        content = read_if_arabic(file_path)
+        clock.lap('read')
+        if content is None:
+            return FileResult(file_path, NO_ARABIC, size=size, timings=clock.timings)
+
+        matches = source_matches(matcher, content, include_comments, html=str(file_path).endswith('.html'))
+        learned = take_learned(matcher)
+        clock.lap('match')
+        if not matches:
+            return FileResult(file_path, UNCHANGED, size=size, timings=clock.timings, learned=learned)
+
+        entries = Counter(m.key for m in matches)
+        if dry_run:
+            diff = unified_diff(file_path, content, matches)
+            clock.lap('write')
+            return FileResult(file_path, TRANSLATED, len(matches), entries, diff,
+                              size=size, timings=clock.timings, learned=learned)
+
+        atomic_write(file_path, apply_matches(content, matches))
+        clock.lap('write')
+        return FileResult(file_path, TRANSLATED, len(matches), entries, size=size, timings=clock.timings,
+                          edits=journal_edits(content, matches), learned=learned)
+    except Exception as e:
+        return FileResult(file_path, ERROR, error=str(e), size=size, timings=clock.timings)
+
+
+def translate_file_locales(file_path, matcher, locales, out_dir, include_comments=False, dry_run=False):
+    """Write file_path translated into every locale, matching it once.
+
+    Files without Arabic are copied as they are, so every locale gets a
+    complete tree. The result counts the primary locale's replacements.
+    """
+    clock = _Clock()
+    size = 0
+    try:
+        if str(file_path).endswith('.json'):
+            raise ValueError('per-locale output is only written for source files')
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            found = has_arabic(f)
+            data = f.read()
+        clock.lap('read')
+
+        status = NO_ARABIC
+        outputs = dict.fromkeys(locales.locales, data)
+        matches = []
+        learned = None
+        if found:
+            content = data.decode('utf-8')
+            per_locale = localized_matches(matcher, content, locales, include_comments,
+                                           html=str(file_path).endswith('.html'))
+            learned = take_learned(matcher)
+            matches = per_locale[locales.locales[0]]
+            status = TRANSLATED if matches else UNCHANGED
+            outputs = {locale: apply_matches(content, m) for locale, m in per_locale.items()}
+        clock.lap('match')
+
+        if not dry_run:
+            for locale, output in outputs.items():
+                path = output_path(out_dir, locale, file_path)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write(path, output)
+        clock.lap('write')
+        return FileResult(file_path, status, len(matches), Counter(m.key for m in matches) if matches else None,
+                          size=size, timings=clock.timings, learned=learned)
+    except Exception as e:
+        return FileResult(file_path, ERROR, error=str(e), size=size, timings=clock.timings)
+
+
+def translate_json_file(file_path, matcher, dry_run=False):
+    """Translate the string values of a JSON file in constant memory.
+
+    Reading, matching and writing are interleaved here, so the whole
+    stream is accounted as 'match' time.
+    """
+    clock = _Clock()
+    size = 0
+    try:
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            found = has_arabic(f, escapes=True)
+        clock.lap('read')
+        if not found:
+            return FileResult(file_path, NO_ARABIC, size=size, timings=clock.timings)
+
+        with open(file_path, 'r', encoding='utf-8', newline='') as src:
+            if dry_run:
+                result = translate_json_stream(src, _NullWriter(), matcher)
+            else:
+                with atomic_output(file_path) as out:
+                    result = translate_json_stream(src, out, matcher)
+                    if not result.replacements:
+                        out.discard()
+        learned = take_learned(matcher)
+        clock.lap('match')
+
+        if not result.replacements:
+            return FileResult(file_path, UNCHANGED, size=size, timings=clock.timings, learned=learned)
+        return FileResult(file_path, TRANSLATED, result.replacements, result.entries,
+                          size=size, timings=clock.timings, edits=None if dry_run else result.edits,
+                          learned=learned)
+    except Exception as e:
+        return FileResult(file_path, ERROR, error=str(e), size=size, timings=clock.timings)
+
+
+def translate_chunked_file(file_path, matcher, dry_run=False):
+    """Translate a very large file in bounded memory; dry runs only count."""
+    clock = _Clock()
+    size = 0
+    try:
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            found = has_arabic(f)
+        clock.lap('read')
+        if not found:
+            return FileResult(file_path, NO_ARABIC, size=size, timings=clock.timings)
+
+        with open(file_path, 'r', encoding='utf-8', newline='') as src:
+            if dry_run:
+                result = translate_chunked(src, _NullWriter(), matcher)
+            else:
+                with atomic_output(file_path) as out:
+                    result = translate_chunked(src, out, matcher)
+                    if not result.replacements:
+                        out.discard()
+        learned = take_learned(matcher)
+        clock.lap('match')
+
+        if not result.replacements:
+            return FileResult(file_path, UNCHANGED, size=size, timings=clock.timings, learned=learned)
+        return FileResult(file_path, TRANSLATED, result.replacements, result.entries,
+                          size=size, timings=clock.timings, edits=None if dry_run else result.edits,
+                          learned=learned)
+    except Exception as e:
+        return FileResult(file_path, ERROR, error=str(e), size=size, timings=clock.timings)
+
+
+class _NullWriter:
+    def write(self, text):
+        return len(text)
+
+
+def unified_diff(file_path, content, matches):
+    """Zero-context unified diff built straight from the match records.
+
+    Only the lines holding a match are looked at; line numbers come from
+    counting newlines between consecutive matches.
+    """
+    out = [f'--- a/{file_path}\n', f'+++ b/{file_path}\n']
+    hunk_old, hunk_new = [], []
+    hunk_start = None
+    line_no = 1
+    counted_to = 0
+    i = 0
+    while i < len(matches):
+        line_start = content.rfind('\n', 0, matches[i].start) + 1
+        line_end = content.find('\n', matches[i].start)
+        if line_end == -1:
+            line_end = len(content)
+        line_no += content.count('\n', counted_to, line_start)
+        counted_to = line_start
+
+        # Every match on this line (matches never span a newline)
+        parts = []
+        pos = line_start
+        while i < len(matches) and matches[i].start < line_end:
+            parts.append(content[pos:matches[i].start])
+            parts.append(matches[i].replacement)
+            pos = matches[i].end
+            i += 1
+        parts.append(content[pos:line_end])
+
+        if hunk_start is not None and line_no != hunk_start + len(hunk_old):
+            out.extend(_hunk(hunk_start, hunk_old, hunk_new))
+            hunk_old, hunk_new = [], []
+        if not hunk_old:
+            hunk_start = line_no
+        hunk_old.append(content[line_start:line_end])
+        hunk_new.append(''.join(parts))
+    out.extend(_hunk(hunk_start, hunk_old, hunk_new))
+    return ''.join(out)
+
+
+def _hunk(start, old, new):
+    yield f'@@ -{start},{len(old)} +{start},{len(new)} @@\n'
+    for line in old:
+        yield f'-{line}\n'
+    for line in new:
+        yield f'+{line}\n'
@@ -0,0 +1,70 @@
+"""Process-pool fan-out for the per-file translation step."""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+# Files per task when the number of files is not known up front
+CHUNKSIZE = 4
+
+# Tasks handed out ahead per worker: enough to keep every worker busy
+# while results are yielded, without reading the whole walk up front
+TASKS_PER_WORKER = 2
+
+
+def resolve_jobs(jobs):
+    """--jobs 0 means one worker per CPU."""
+    if jobs is None or jobs < 0:
+        return 1
+    return jobs or os.cpu_count() or 1
+
+
+def map_files(func, files, jobs=1, initializer=None, initargs=()):
+    """Yield func(path) for every file, in the order the files were given.
+
+    files may be a lazy iterable (the tree walker); it is consumed as the
+    work is handed out, at most TASKS_PER_WORKER tasks per worker ahead of
+    the results yielded so far. With jobs > 1 the files are spread over a process
+    pool. initializer runs once in each worker, which is how the compiled
+    matcher is handed over a single time per process instead of being
+    pickled with every task. Workers are only started once there is a file
+    to give them.
+    """
+    jobs = resolve_jobs(jobs)
+    if hasattr(files, '__len__'):
+        jobs = min(jobs, len(files))
+        chunksize = max(1, len(files) // (jobs * 4)) if jobs else 1
+    else:
+        chunksize = CHUNKSIZE
+    if jobs <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for file_path in files:
+            yield func(file_path)
+        return
+
+    files = iter(files)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs) as executor:
+        tasks = deque()
+
+        def submit():
+            chunk = list(islice(files, chunksize))
+            if chunk:
+                tasks.append(executor.submit(_map_chunk, func, chunk))
+            return bool(chunk)
+
+        try:
+            while len(tasks) < jobs * TASKS_PER_WORKER and submit():
+                pass
+            while tasks:
+                results = tasks.popleft().result()
+                submit()
+                yield from results
+        finally:
+            # Stopped early: drop the tasks no worker has started on
+            for task in tasks:
+                task.cancel()
+
+
+def _map_chunk(func, chunk):
+    return [func(file_path) for file_path in chunk]
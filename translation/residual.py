@@ -0,0 +1,170 @@
+"""Residual-Arabic report: what is still untranslated, and what to add first.
+
+One pass over the tree (spread over --jobs workers) collects every run of
+Arabic words left in the translatable spans, with its file:line. Word 1- to
+3-grams are ranked by occurrences x number of files they appear in, which
+puts the strings shared across many components on top, and the ranking can
+be written out as a dictionary stub to fill in:
+
+    python -m translation residual --top 50 --stub residual-stub.json
+"""
+import json
+import sys
+from bisect import bisect_right
+from collections import Counter, namedtuple
+from pathlib import Path
+
+from .arabic import LETTER_RUN, LETTER_WORD
+from .fileio import read_if_arabic
+from .lexer import html_spans, js_spans
+from .pool import map_files
+from .store import DictionaryStore
+from .walk import IgnoreRules, walk
+
+SOURCE_SUFFIXES = ('.js', '.jsx')
+
+MAX_NGRAM = 3
+
+# One run of Arabic words left in a file
+Residual = namedtuple('Residual', 'path line text')
+
+# Per-file scan result: residual runs and n-gram counts
+FileScan = namedtuple('FileScan', 'path runs ngrams chars fragments error', defaults=(0, None))
+
+
+def ngrams(words, max_n=MAX_NGRAM):
+    for n in range(1, max_n + 1):
+        for i in range(len(words) - n + 1):
+            yield ' '.join(words[i:i + n])
+
+
+def scan_file(file_path, include_comments=False):
+    """Residual runs of one file (worker side)."""
+    try:
+        text = read_if_arabic(file_path)
+    except (OSError, UnicodeDecodeError) as e:
+        return FileScan(file_path, [], Counter(), 0, error=str(e))
+    if text is None:
+        return FileScan(file_path, [], Counter(), 0)
+    if str(file_path).endswith('.json'):
+        spans = [(0, len(text))]
+    elif str(file_path).endswith('.html'):
+        spans = [(s.start, s.end) for s in html_spans(text)]
+    else:
+        spans = [(s.start, s.end) for s in js_spans(text, include_comments)]
+
+    newlines = [i for i, ch in enumerate(text) if ch == '\n']
+    runs = []
+    counts = Counter()
+    chars = fragments = 0
+    for start, end in spans:
+        for m in LETTER_RUN.finditer(text, start, end):
+            runs.append(Residual(str(file_path), bisect_right(newlines, m.start()) + 1, m.group()))
+            words = []
+            for w in LETTER_WORD.finditer(text, m.start(), m.end()):
+                chars += w.end() - w.start()
+                if _is_latin(text, w.start() - 1) or _is_latin(text, w.end()):
+                    # Left over from a substring replacement ('الCourse'):
+                    # not a word to add to the dictionary
+                    fragments += 1
+                    counts.update(ngrams(words))
+                    words = []
+                else:
+                    words.append(w.group())
+            counts.update(ngrams(words))
+    return FileScan(file_path, runs, counts, chars, fragments)
+
+
+def _is_latin(text, i):
+    return 0 <= i < len(text) and text[i].isascii() and text[i].isalpha()
+
+
+class ResidualReport:
+    """Merged scans of a tree, with the n-gram ranking."""
+
+    def __init__(self, known=()):
+        self.known = set(known)
+        self.runs = []
+        self.counts = Counter()
+        self.files = Counter()
+        self.chars = 0
+        self.fragments = 0
+        self.scanned = 0
+        self.errors = []
+
+    def add(self, scan):
+        self.scanned += 1
+        if scan.error:
+            self.errors.append((scan.path, scan.error))
+            return
+        self.runs.extend(scan.runs)
+        self.counts.update(scan.ngrams)
+        self.files.update(scan.ngrams.keys())
+        self.chars += scan.chars
+        self.fragments += scan.fragments
+
+    def ranked(self):
+        """[(ngram, score, count, files)] best first, skipping dictionary keys."""
+        rows = [(g, c * self.files[g], c, self.files[g]) for g, c in self.counts.items() if g not in self.known]
+        rows.sort(key=lambda r: (-r[1], -len(r[0]), r[0]))
+        return rows
+
+    def stub(self, top=None):
+        """Dictionary stub: the ranked n-grams with empty translations."""
+        return {g: '' for g, *_ in self.ranked()[:top]}
+
+
+def scan_tree(files, jobs=1, include_comments=False, known=()):
+    report = ResidualReport(known)
+    func = _scan_with_comments if include_comments else scan_file
+    for scan in map_files(func, files, jobs):
+        report.add(scan)
+    return report
+
+
+def _scan_with_comments(file_path):
+    return scan_file(file_path, include_comments=True)
+
+
+def add_arguments(parser):
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help='files or directories to scan (default: src)')
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='number of worker processes (default: one per CPU)')
+    parser.add_argument('--include-comments', action='store_true',
+                        help='also report Arabic inside // and /* */ comments')
+    parser.add_argument('--top', type=int, default=40,
+                        help='how many n-grams to rank (default: 40)')
+    parser.add_argument('--locations', action='store_true',
+                        help='list every residual run as file:line')
+    parser.add_argument('--stub', type=Path, metavar='FILE.json',
+                        help='write the top n-grams as a dictionary stub to fill in')
+    return parser
+
+
+def run(args, out=sys.stdout):
+    files = walk(args.paths or [Path('src')], SOURCE_SUFFIXES, IgnoreRules().add_file('.gitignore'))
+    report = scan_tree(files, args.jobs, args.include_comments, DictionaryStore().translations())
+
+    if args.locations:
+        for r in report.runs:
+            print(f'{r.path}:{r.line}: {r.text}', file=out)
+        print(file=out)
+    for path, error in report.errors:
+        print(f'✗ {path}: {error}', file=out)
+
+    ranked = report.ranked()[:args.top]
+    print(f'{report.chars} Arabic letters in {len(report.runs)} runs across '
+          f'{len({r.path for r in report.runs})} of {report.scanned} files', file=out)
+    if report.fragments:
+        print(f'{report.fragments} words are fragments glued to Latin text (left out of the ranking)', file=out)
+    if ranked:
+        width = len(str(ranked[0][1]))
+        print(f"\n{'score':>{width}}  count  files  n-gram", file=out)
+        for gram, score, count, nfiles in ranked:
+            print(f'{score:>{width}}  {count:>5}  {nfiles:>5}  {gram}', file=out)
+    if args.stub:
+        args.stub.write_text(json.dumps(report.stub(args.top), ensure_ascii=False, indent=2) + '\n',
+                             encoding='utf-8')
+        print(f'\nWrote {len(ranked)} entries to {args.stub}', file=out)
+    return 0
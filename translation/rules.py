@@ -0,0 +1,151 @@
+"""Ordered rule phases around the dictionary (what the old .sh scripts did).
+
+translation/dictionaries/rules.json lists the rules of two phases that run
+before and after the dictionary:
+
+    {"pre":  [{"literal": "...", "replacement": "..."},
+              {"regex": "...", "replacement": "..."}],
+     "post": [...]}
+
+Within a phase the literal rules are compiled into one Matcher (longest
+first, like the dictionary) and the regex rules into one alternation, so a
+phase is at most two passes instead of one pass per rule. A regex rule's
+replacement may use \\1 / \\g<name> references to its own groups, but its
+pattern must not refer back to groups by number since the alternation
+renumbers them.
+
+Every phase sees the output of the one before, and PhasedMatcher folds the
+phases' matches back onto the original text, so the match records,
+diffs and journal of a run still describe one set of edits.
+"""
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from .matcher import Match, Matcher, apply_matches
+
+PHASES = ('pre', 'post')
+
+
+class RegexRules:
+    """One phase's regex rules as a single alternation."""
+
+    def __init__(self, rules):
+        self.patterns = [re.compile(pattern) for pattern, _ in rules]
+        self.replacements = [replacement for _, replacement in rules]
+        self._alternation = re.compile('|'.join(f'(?P<r{i}>{p.pattern})' for i, p in enumerate(self.patterns)))
+
+    # A regex match has no length bound
+    longest_match = None
+
+    def matches(self, text, start=0, end=None):
+        end = len(text) if end is None else end
+        found = []
+        for m in self._alternation.finditer(text, start, end):
+            if m.start() == m.end():
+                continue
+            i = int(m.lastgroup[1:])
+            own = self.patterns[i].match(text, m.start(), m.end())
+            replacement = own.expand(self.replacements[i]) if own else self.replacements[i]
+            found.append(Match(m.start(), m.end(), self.patterns[i].pattern, replacement))
+        return found
+
+
+def compile_phase(rules):
+    """The matchers (literal, then regex) for one phase's rule list."""
+    literals = {r['literal']: r['replacement'] for r in rules if 'literal' in r}
+    regexes = [(r['regex'], r['replacement']) for r in rules if 'regex' in r]
+    phase = []
+    if literals:
+        phase.append(Matcher(literals))
+    if regexes:
+        phase.append(RegexRules(regexes))
+    return phase
+
+
+def load_rules(path):
+    """{'pre': [...], 'post': [...]} from path; a missing file has no rules."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        data = {}
+    return {phase: data.get(phase, []) for phase in PHASES}
+
+
+def rules_hash(path):
+    """Hash of the rules file; part of the engine options in the manifest."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+    except FileNotFoundError:
+        return None
+
+
+class PhasedMatcher:
+    """pre-fix rules, the dictionary Matcher, then post-fix rules."""
+
+    def __init__(self, dictionary, rules):
+        self.dictionary = dictionary
+        self.clitics = dictionary.clitics
+        self.phases = compile_phase(rules.get('pre', [])) + [dictionary] + compile_phase(rules.get('post', []))
+
+    def matches(self, text, start=0, end=None, escape=None):
+        """Matches of all phases against text[start:end], in text order.
+
+        A later phase that rewrites (part of) an earlier replacement is
+        merged with it into one match over the original text.
+        """
+        end = len(text) if end is None else end
+        current, lo, hi = text, start, end
+        # [orig_start, orig_end, cur_start, cur_end, key, replacement], with
+        # offsets relative to start
+        edits = []
+        for matcher in self.phases:
+            found = matcher.matches(current, lo, hi)
+            if not found:
+                continue
+            base = current[lo:hi]
+            found = [Match(m.start - lo, m.end - lo, m.key,
+                           escape(m.replacement) if escape else m.replacement) for m in found]
+            edits = _compose(edits, base, found)
+            current, lo, hi = apply_matches(base, found), 0, None
+        return [Match(o_s + start, o_e + start, key, replacement) for o_s, o_e, _, _, key, replacement in edits]
+
+    def translate(self, text):
+        return apply_matches(text, self.matches(text))
+
+
+def _compose(edits, base, found):
+    """Fold matches found on base (the text edits produced) into edits."""
+    items = sorted([(e[2], e[3], 0, e) for e in edits] + [(m.start, m.end, 1, m) for m in found],
+                   key=lambda item: (item[0], item[1], item[2]))
+    out = []
+    shift_old = 0   # base offset minus original offset, before the group
+    shift_new = 0   # new offset minus base offset, before the group
+    i = 0
+    while i < len(items):
+        group_start, group_end = items[i][0], items[i][1]
+        group = [items[i]]
+        i += 1
+        while i < len(items) and items[i][0] < group_end:
+            group_end = max(group_end, items[i][1])
+            group.append(items[i])
+            i += 1
+
+        orig_start = group_start - shift_old
+        shift_old += sum((e[3] - e[2]) - (e[1] - e[0]) for _, _, new, e in group if not new)
+        orig_end = group_end - shift_old
+        news = [m for _, _, new, m in group if new]
+        if not news:
+            e = group[0][3]
+            out.append([e[0], e[1], e[2] + shift_new, e[3] + shift_new, e[4], e[5]])
+            continue
+
+        piece = apply_matches(base[group_start:group_end],
+                              [m._replace(start=m.start - group_start, end=m.end - group_start) for m in news])
+        key = ' + '.join(e[4] if not new else e.key for _, _, new, e in group)
+        new_start = group_start + shift_new
+        shift_new += len(piece) - (group_end - group_start)
+        out.append([orig_start, orig_end, new_start, group_end + shift_new, key, piece])
+    return out
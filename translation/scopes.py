@@ -0,0 +1,124 @@
+"""Path-scoped dictionary overlays.
+
+A word can mean one thing in one corner of the app and something else (or
+nothing worth translating) everywhere else. translation/dictionaries/
+scopes.json maps .gitignore-style path patterns to overlay layers that
+are stacked on top of the global layers for the files they match:
+
+    {"scopes": [
+      {"paths": ["src/components/instructor/EarningsTab.jsx"], "layers": ["earnings"]},
+      {"paths": ["src/pages/AdminInstructorPanel.jsx"], "layers": ["admin-panel"]}
+    ]}
+
+An overlay is an ordinary layer file that is left out of the global stack;
+its entries win over the global ones in its scope. A file in several
+scopes gets all of their overlays, in the order the scopes are listed.
+
+Every distinct combination of overlays is one compiled matcher, built on
+first use, cached (in the process and on disk like any other, see
+cache.py) and shared by every file that has that combination. Files
+outside every scope use the plain global matcher.
+"""
+import json
+
+from .memory import MemoryMatcher
+from .walk import IgnoreRules
+
+SCOPES_FILE = 'scopes.json'
+
+
+class Scopes:
+    """The scopes of scopes.json: which overlays apply to a path."""
+
+    def __init__(self, scopes=()):
+        self.config = [{'paths': list(s['paths']), 'layers': list(s['layers'])} for s in scopes]
+        self._rules = [(IgnoreRules(s['paths']), tuple(s['layers'])) for s in self.config]
+
+    @classmethod
+    def load(cls, path):
+        """The scopes listed in path; a missing file has none."""
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        return cls(data.get('scopes', []))
+
+    def __bool__(self):
+        return bool(self._rules)
+
+    def layers(self):
+        """Every overlay layer some scope uses, in order of first use."""
+        return tuple(dict.fromkeys(name for _, layers in self._rules for name in layers))
+
+    def overlays(self, path):
+        """The overlay layers for path, () outside every scope."""
+        found = []
+        for rules, layers in self._rules:
+            if rules.excludes(path):
+                found.extend(name for name in layers if name not in found)
+        return tuple(found)
+
+
+class ScopedMatcher:
+    """One matcher per overlay combination, picked by path.
+
+    Everything but for_path() is the global matcher's, so text that comes
+    without a path is matched against the global layers only. With a
+    memory, every combination is wrapped in a MemoryMatcher that files its
+    literals under its own overlays.
+    """
+
+    def __init__(self, store, scopes, clitics=False, normalize=False, memory=None):
+        self.store = store
+        self.scopes = scopes
+        self.clitics = clitics
+        self.normalize = normalize
+        self.memory = memory
+        self._matchers = {}
+        self.base = self.combination(())
+
+    def __getattr__(self, name):
+        return getattr(self.base, name)
+
+    def __getstate__(self):
+        return self.__dict__
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def combination(self, overlays):
+        """The matcher for the global layers with overlays on top."""
+        matcher = self._matchers.get(overlays)
+        if matcher is None:
+            matcher = self.store.matcher(clitics=self.clitics, normalize=self.normalize, overlays=overlays)
+            if self.memory is not None:
+                matcher = MemoryMatcher(matcher, self.memory, overlays)
+            self._matchers[overlays] = matcher
+        return matcher
+
+    def for_path(self, path):
+        return self.combination(self.scopes.overlays(path))
+
+    def matches(self, text, start=0, end=None, escape=None):
+        return self.base.matches(text, start, end, escape)
+
+    def translate(self, text):
+        return self.base.translate(text)
+
+
+def scoped_matcher(store, clitics=False, normalize=False, memory=None):
+    """store's matcher, scoped by path if the store has scopes, behind memory if given."""
+    scopes = store.scopes()
+    if scopes:
+        return ScopedMatcher(store, scopes, clitics, normalize, memory)
+    matcher = store.matcher(clitics=clitics, normalize=normalize)
+    return matcher if memory is None else MemoryMatcher(matcher, memory)
+
+
+def matcher_for(matcher, path):
+    """(matcher, overlays) to use on path: a ScopedMatcher's pick, anything else as is."""
+    if isinstance(matcher, ScopedMatcher) and path is not None:
+        overlays = matcher.scopes.overlays(path)
+        return matcher.combination(overlays), overlays
+    return matcher, ()
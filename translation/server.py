@@ -0,0 +1,151 @@
+"""--serve: answer JSON-lines translation requests on stdin/stdout.
+
+A build tool starts the server once and pays for interpreter startup and
+the matcher build only then; every file after that costs one match pass.
+One request per line, one response per line, in request order:
+
+    {"id": 1, "path": "src/pages/Home.jsx"}
+    {"id": 2, "text": "<p>مرحبا</p>", "kind": "html", "matches": true}
+    {"id": 3, "path": "src/App.jsx", "write": true}
+    {"op": "reload"}        after editing the dictionaries
+    {"op": "stats"}
+
+Request fields: id (echoed back), path or text (text wins; path then only
+sets the kind), kind (js, html, json or text), write (replace the file at
+path, journaled like a normal run so --undo works) and matches (also send
+the match records). A response carries id, text (left out after a write),
+replacements, entries (per dictionary key), elapsed_ms and, if asked,
+matches as [start, end, key, replacement] over the input; a failed request
+gets id and error instead.
+
+Requests may be pipelined: a reader thread queues lines as they arrive
+and responses are flushed when the queue runs dry, so a burst of files
+costs one write to the pipe, not one per file.
+"""
+import json
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+
+from .journal import Journal
+
+_EOF = object()
+
+
+def _read_lines(stream, lines):
+    for line in stream:
+        lines.put(line)
+    lines.put(_EOF)
+
+
+class Server:
+    """Handles the requests of one --serve session."""
+
+    def __init__(self, translator, out, journal=None):
+        self.translator = translator
+        self.out = out
+        self.journal = journal
+        self.requests = 0
+        self.errors = 0
+        self.replacements = 0
+        self.busy = 0.0
+
+    def run(self, stream):
+        lines = queue.Queue()
+        threading.Thread(target=_read_lines, args=(stream, lines), daemon=True).start()
+        while True:
+            line = lines.get()
+            if line is _EOF:
+                break
+            if line.strip():
+                self.out.write(json.dumps(self.handle(line), ensure_ascii=False) + '\n')
+            if lines.empty():
+                self.out.flush()
+        self.out.flush()
+
+    def handle(self, line):
+        started = time.perf_counter()
+        self.requests += 1
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('a request is a JSON object')
+            request_id = request.get('id')
+            op = request.get('op', 'translate')
+            if op == 'translate':
+                response = self._translate(request)
+            elif op == 'reload':
+                self.translator.reload()
+                response = {'load_ms': round(self.translator.load_seconds * 1000, 3)}
+            elif op == 'stats':
+                response = self.stats()
+            else:
+                raise ValueError(f'unknown op {op!r}')
+        except (OSError, UnicodeDecodeError, ValueError, TypeError) as e:
+            self.errors += 1
+            response = {'error': str(e)}
+        elapsed = time.perf_counter() - started
+        self.busy += elapsed
+        return {'id': request_id, **response, 'elapsed_ms': round(elapsed * 1000, 3)}
+
+    def _translate(self, request):
+        path = request.get('path')
+        kind = request.get('kind')
+        if path is not None and not isinstance(path, str):
+            # An int would be taken for a file descriptor (1 is stdout)
+            raise TypeError('"path" must be a string')
+        written = False
+        if 'text' in request:
+            if not isinstance(request['text'], str):
+                raise TypeError('"text" must be a string')
+            result = self.translator.translate(request['text'], kind, path)
+        elif path:
+            written = bool(request.get('write'))
+            result, edits = self.translator.translate_path(path, kind, write=written)
+            if edits and self.journal is not None:
+                self.journal.record(path, edits)
+        else:
+            raise ValueError('a request needs "text" or "path"')
+        self.replacements += len(result.matches)
+        response = {} if written else {'text': result.text}
+        response['replacements'] = len(result.matches)
+        response['entries'] = dict(Counter(m.key for m in result.matches))
+        if request.get('matches'):
+            response['matches'] = [[m.start, m.end, m.key, m.replacement] for m in result.matches]
+        return response
+
+    def stats(self):
+        stats = {'requests': self.requests, 'errors': self.errors, 'replacements': self.replacements,
+                 'busy_ms': round(self.busy * 1000, 3),
+                 'load_ms': round(self.translator.load_seconds * 1000, 3)}
+        memory = getattr(self.translator.matcher, 'memory', None)
+        if memory is not None:
+            stats['memory'] = {'entries': len(memory.entries), 'hits': memory.hits, 'misses': memory.misses}
+        return stats
+
+
+def serve(translator, stdin=sys.stdin, stdout=sys.stdout, log=sys.stderr):
+    """Run the JSON-lines server until stdin closes; returns an exit status."""
+    for stream in (stdin, stdout):
+        if hasattr(stream, 'reconfigure'):
+            stream.reconfigure(encoding='utf-8', newline='')
+    journal = Journal()
+    server = Server(translator, stdout, journal)
+    print(f'Serving translations on stdin/stdout (matcher ready in '
+          f'{translator.load_seconds * 1000:.0f} ms)', file=log, flush=True)
+    try:
+        server.run(stdin)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        journal.close()
+        translator.save_memory()
+    print(f'Served {server.requests} requests ({server.errors} failed), '
+          f'{server.replacements} replacements in {server.busy:.3f}s', file=log)
+    if journal.files:
+        print(f'Journaled run {journal.run_id} ({journal.files} files; '
+              f'revert with --undo {journal.run_id})', file=log)
+    return 0
@@ -0,0 +1,106 @@
+"""--stats / --profile: where a run spends its time and which entries fire.
+
+Without a --stats file the report (and the profile dumps next to it) go
+to the cache directory, not the working tree.
+"""
+import cProfile
+import datetime
+import io
+import json
+import pstats
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+from .cache import CACHE_DIR
+
+STATS_PATH = CACHE_DIR / 'translation-stats.json'
+
+
+class RunStats:
+    """Collects FileResults of one run and writes them out as JSON."""
+
+    def __init__(self, translations, options=None, jobs=1):
+        self.translations = translations
+        self.options = options or {}
+        self.jobs = jobs
+        self.started = datetime.datetime.now().isoformat(timespec='seconds')
+        self._t0 = time.perf_counter()
+        self.entries = Counter()
+        self.files = []
+        self.fresh = 0
+
+    def add(self, result):
+        if result is None:
+            # Skipped through the manifest without being opened
+            self.fresh += 1
+            return
+        if result.entries:
+            self.entries.update(result.entries)
+        timings = result.timings or {}
+        self.files.append({
+            'path': str(result.path),
+            'status': result.status,
+            'bytes': result.size,
+            'replacements': result.replacements,
+            'wall_s': round(sum(timings.values()), 6),
+            **{f'{phase}_s': round(seconds, 6) for phase, seconds in timings.items()},
+        })
+
+    def as_dict(self):
+        phases = Counter()
+        for f in self.files:
+            for phase in ('read', 'match', 'write'):
+                phases[phase] += f.get(f'{phase}_s', 0.0)
+        return {
+            'run': {
+                'started': self.started,
+                'wall_s': round(time.perf_counter() - self._t0, 6),
+                'jobs': self.jobs,
+                'options': self.options,
+                'files': len(self.files) + self.fresh,
+                'processed': len(self.files),
+                'skipped_by_manifest': self.fresh,
+                'bytes': sum(f['bytes'] for f in self.files),
+                'replacements': sum(self.entries.values()),
+                **{f'{phase}_s': round(seconds, 6) for phase, seconds in phases.items()},
+            },
+            'entries': dict(self.entries.most_common()),
+            # Only meaningful over a full pass: files skipped through the
+            # manifest are not matched at all (use --force)
+            'never_matched': [key for key in self.translations if key not in self.entries],
+            'files': sorted(self.files, key=lambda f: f['wall_s'], reverse=True),
+        }
+
+    def write(self, path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(self.as_dict(), ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+class Profiler:
+    """cProfile + tracemalloc around a run, dumped next to the stats file."""
+
+    def __init__(self, stats_path):
+        self.base = Path(stats_path)
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        tracemalloc.start(10)
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.base.parent.mkdir(parents=True, exist_ok=True)
+        self.profile.dump_stats(self.base.with_suffix('.prof'))
+        text = io.StringIO()
+        pstats.Stats(self.profile, stream=text).sort_stats('cumulative').print_stats(40)
+        self.base.with_suffix('.prof.txt').write_text(text.getvalue(), encoding='utf-8')
+
+        lines = [f'current {current / 1e6:.2f} MB, peak {peak / 1e6:.2f} MB', '']
+        lines.extend(str(stat) for stat in snapshot.statistics('lineno')[:40])
+        self.base.with_suffix('.tracemalloc.txt').write_text('\n'.join(lines) + '\n', encoding='utf-8')
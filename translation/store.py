@@ -0,0 +1,291 @@
+"""Layered on-disk dictionary store shared by every translate*.py script.
+
+Layers live in translation/dictionaries/<name>.json as flat
+{"arabic": "english"} objects and are stacked in order: common and words
+(the terms of the old shell scripts) and base first, then the domain
+layers (instructor, admin), then overrides. A key from a later layer replaces the
+value of an earlier one but keeps the earlier position, which is what
+decides ties between keys of the same length.
+
+words holds single words that are only safe to match whole. Without
+--clitics a key matches anywhere, inside longer words too ('تم' in 'يتم'
+would become 'يDone'), but the keys listed in words only ever match
+whole words (see Matcher). A later layer can still change their value.
+`validate` flags the keys of the other layers that match inside longer
+words of the tree; those belong in words.
+
+An entry can also hold one column per target locale,
+{"arabic": {"en": "...", "fr": "..."}}; a plain string is the English
+column. Columns are merged one by one, so a later layer can add French to
+an entry without repeating its English. English drives the matcher and
+the other columns are rendered from its match records (see locales.py).
+
+rules.json next to them holds the pre-fix and post-fix rule phases that
+run around the dictionary (see rules.py), and scopes.json the overlay
+layers stacked on top of all this for some paths only (see scopes.py).
+"""
+import hashlib
+import json
+import sys
+from collections import Counter, namedtuple
+from pathlib import Path
+
+from .arabic import is_letter
+from .cache import compile_matcher
+from .fileio import read_if_arabic
+from .lexer import source_matches
+from .normalize import NormalizedMatcher, normalize as _normalize, normalize_keys
+from .rules import PhasedMatcher, load_rules, rules_hash
+from .scopes import SCOPES_FILE, Scopes, matcher_for, scoped_matcher
+
+DICTIONARY_DIR = Path(__file__).resolve().parent / 'dictionaries'
+
+DEFAULT_LAYERS = ('common', 'words', 'base', 'instructor', 'admin', 'overrides')
+
+OVERRIDE_LAYER = 'overrides'
+
+# Only matched with --clitics, see above
+WORD_LAYER = 'words'
+
+RULES_FILE = 'rules.json'
+
+# The column the dictionary matcher is built from
+PRIMARY_LOCALE = 'en'
+
+# kind is 'conflict', 'duplicate', 'unreachable', 'untranslated' or 'in-word'
+Issue = namedtuple('Issue', 'kind key message')
+
+
+def entry_columns(value):
+    """{locale: text} for a dictionary value, plain or multi-column."""
+    return {PRIMARY_LOCALE: value} if isinstance(value, str) else dict(value)
+
+
+def _show(columns):
+    return columns[PRIMARY_LOCALE] if list(columns) == [PRIMARY_LOCALE] else columns
+
+
+class DictionaryStore:
+    """Lazily loaded stack of dictionary layers."""
+
+    def __init__(self, directory=DICTIONARY_DIR, layers=DEFAULT_LAYERS):
+        self.directory = Path(directory)
+        self.layer_names = tuple(layers)
+        self._layers = {}
+        self._duplicates = {}
+        self._columns = {}
+        self._translations = {}
+        self._scopes = None
+
+    def layer(self, name):
+        """Entries of one layer, read from disk on first use."""
+        if name not in self._layers:
+            path = self.directory / f'{name}.json'
+            duplicates = []
+
+            def collect(pairs):
+                seen = {}
+                for key, value in pairs:
+                    if key in seen:
+                        duplicates.append(key)
+                    seen[key] = value
+                return seen
+
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self._layers[name] = json.load(f, object_pairs_hook=collect)
+            except FileNotFoundError:
+                self._layers[name] = {}
+            self._duplicates[name] = duplicates
+        return self._layers[name]
+
+    def columns(self, overlays=()):
+        """{key: {locale: text}} merged over the layers (and overlays), in priority order."""
+        if overlays not in self._columns:
+            merged = {}
+            for name in self.layer_names + tuple(overlays):
+                for key, value in self.layer(name).items():
+                    merged.setdefault(key, {}).update(entry_columns(value))
+            self._columns[overlays] = merged
+        return self._columns[overlays]
+
+    def translations(self, locale=PRIMARY_LOCALE, overlays=()):
+        """The merged dictionary for one locale, in priority order."""
+        if locale != PRIMARY_LOCALE:
+            return {key: c[locale] for key, c in self.columns(overlays).items() if locale in c}
+        if overlays not in self._translations:
+            self._translations[overlays] = {key: c[PRIMARY_LOCALE] for key, c in self.columns(overlays).items()
+                                            if PRIMARY_LOCALE in c}
+        return self._translations[overlays]
+
+    def whole_words(self):
+        """The keys that only match whole words, whatever the mode."""
+        return tuple(self.layer(WORD_LAYER)) if WORD_LAYER in self.layer_names else ()
+
+    def locales(self):
+        """Every locale some entry has a column for, the primary one first."""
+        found = {locale for c in self.columns().values() for locale in c}
+        return [PRIMARY_LOCALE] + sorted(found - {PRIMARY_LOCALE})
+
+    def rules(self):
+        return load_rules(self.directory / RULES_FILE)
+
+    def rules_hash(self):
+        return rules_hash(self.directory / RULES_FILE)
+
+    def scopes(self):
+        """The path scopes and their overlay layers (see scopes.py)."""
+        if self._scopes is None:
+            self._scopes = Scopes.load(self.directory / SCOPES_FILE)
+        return self._scopes
+
+    def scopes_hash(self):
+        """Hash of the scopes and their overlays' entries; None without scopes."""
+        scopes = self.scopes()
+        if not scopes:
+            return None
+        payload = json.dumps([scopes.config, [(name, self.layer(name)) for name in scopes.layers()]],
+                             ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    def matcher(self, clitics=False, normalize=False, overlays=()):
+        """The full pipeline: pre-fix rules, dictionary, post-fix rules."""
+        dictionary = self.dictionary_matcher(clitics=clitics, normalize=normalize, overlays=overlays)
+        rules = self.rules()
+        if not any(rules.values()):
+            return dictionary
+        return PhasedMatcher(dictionary, rules)
+
+    def dictionary_matcher(self, clitics=False, normalize=False, overlays=()):
+        translations = self.translations(overlays=overlays)
+        whole_words = self.whole_words()
+        if normalize:
+            # Normalized once here; the compiled result is cached like any other
+            return NormalizedMatcher(compile_matcher(normalize_keys(translations), clitics=clitics,
+                                                     whole_words=[_normalize(key) for key in whole_words]))
+        return compile_matcher(translations, clitics=clitics, whole_words=whole_words)
+
+    def validate(self, clitics=False, normalize=False, files=()):
+        """Report conflicting, duplicated and unreachable keys.
+
+        Keys that match inside longer Arabic words of files (the sources a
+        run would translate) are reported as 'in-word'. With normalize, keys that are spellings of one another are
+        reported too: one entry covers them all. Overlay layers are checked
+        against the global layers they are stacked on; an overlay giving a
+        key another meaning in its scope is what it is for, not a conflict.
+        """
+        issues = []
+        defined = {}
+        for name in self.layer_names:
+            layer = self.layer(name)
+            for key in self._duplicates[name]:
+                issues.append(Issue('duplicate', key, f'listed more than once in {name}.json'))
+            for key, value in layer.items():
+                value = entry_columns(value)
+                for other, other_value in defined.get(key, []):
+                    shared = value.keys() & other_value.keys()
+                    if not shared:
+                        continue
+                    if all(other_value[locale] == value[locale] for locale in shared):
+                        issues.append(Issue('duplicate', key,
+                                            f'{name}.json repeats the {other}.json translation {_show(value)!r}'))
+                    elif name != OVERRIDE_LAYER and key not in self.layer(OVERRIDE_LAYER):
+                        issues.append(Issue('conflict', key,
+                                            f'{other}.json says {_show(other_value)!r}, {name}.json says '
+                                            f'{_show(value)!r} ({name} wins; settle it in {OVERRIDE_LAYER}.json)'))
+                defined.setdefault(key, []).append((name, value))
+        for key, columns in self.columns().items():
+            if PRIMARY_LOCALE not in columns:
+                issues.append(Issue('untranslated', key, f'has no {PRIMARY_LOCALE!r} column, so it never matches'))
+
+        # A key can never match if another key always claims (part of) its text
+        matcher = self.dictionary_matcher(clitics=clitics)
+        for key in self.translations():
+            winners = _winners(matcher, key)
+            if winners is not None:
+                issues.append(Issue('unreachable', key, f'never matches on its own text (matched by {winners})'))
+
+        translations = self.translations()
+        for name in self.scopes().layers():
+            layer = self.layer(name)
+            for key in self._duplicates[name]:
+                issues.append(Issue('duplicate', key, f'listed more than once in {name}.json'))
+            matcher = self.dictionary_matcher(clitics=clitics, overlays=(name,))
+            for key, value in layer.items():
+                value = entry_columns(value)
+                if translations.get(key) == value.get(PRIMARY_LOCALE):
+                    issues.append(Issue('duplicate', key,
+                                        f'{name}.json repeats the global translation {_show(value)!r}'))
+                winners = _winners(matcher, key)
+                if winners is not None:
+                    issues.append(Issue('unreachable', key, f'never matches on its own text in the {name} '
+                                                            f'scope (matched by {winners})'))
+
+        if normalize:
+            spellings = {}
+            for key, value in self.translations().items():
+                other = spellings.setdefault(_normalize(key), key)
+                if other == key:
+                    continue
+                other_value = self.translations()[other]
+                if other_value == value:
+                    issues.append(Issue('duplicate', key, f'a spelling of {other!r}, which already covers it'))
+                else:
+                    issues.append(Issue('conflict', key, f'a spelling of {other!r} ({other_value!r}), '
+                                                         f'which wins over {value!r} once normalized'))
+
+        counts, examples = _in_word(scoped_matcher(self, clitics, normalize), files)
+        for key, count in counts.items():
+            word, path, line = examples[key]
+            issues.append(Issue('in-word', key, f'matches inside longer words {count} time(s), e.g. {word!r} '
+                                                f'at {path}:{line} (move it to {WORD_LAYER}.json)'))
+        return issues
+
+
+def _winners(matcher, key):
+    """None if key matches its own text as one match, else what does match it."""
+    found = matcher.matches(key)
+    if len(found) == 1 and found[0].start == 0 and found[0].end == len(key) and found[0].key == key:
+        return None
+    return ', '.join(repr(m.key) for m in found) or 'nothing'
+
+
+def _in_word(matcher, files):
+    """({key: count}, {key: (word, path, line)}) for the matches inside longer words of files."""
+    counts = Counter()
+    examples = {}
+    for path in files:
+        if path.suffix.lower() == '.json':
+            # String values are matched as whole tokens, without per-key offsets
+            continue
+        try:
+            text = read_if_arabic(path)
+        except (OSError, UnicodeDecodeError):
+            continue
+        if text is None:
+            continue
+        for m in source_matches(matcher_for(matcher, path)[0], text):
+            if not ((m.start and is_letter(text[m.start - 1])) or (m.end < len(text) and is_letter(text[m.end]))):
+                continue
+            counts[m.key] += 1
+            if m.key not in examples:
+                start, end = m.start, m.end
+                while start and is_letter(text[start - 1]):
+                    start -= 1
+                while end < len(text) and is_letter(text[end]):
+                    end += 1
+                examples[m.key] = (text[start:end], path, text.count('\n', 0, m.start) + 1)
+    return counts, examples
+
+
+def report_issues(store, clitics=False, normalize=False, files=(), out=sys.stdout):
+    """Print the validation report; returns the number of issues found."""
+    issues = store.validate(clitics=clitics, normalize=normalize, files=files)
+    for issue in issues:
+        print(f'{issue.kind:<12} {issue.key}: {issue.message}', file=out)
+    overlays = store.scopes().layers()
+    print(f'{len(issues)} issue(s) in {len(store.translations())} entries '
+          f'from layers {", ".join(store.layer_names)}'
+          + (f' and overlays {", ".join(overlays)}' if overlays else ''), file=out)
+    return len(issues)
+
@@ -0,0 +1,119 @@
+"""Translator: one resident compiled matcher behind a small API.
+
+For callers that translate many texts in one process (the --serve mode,
+a build-tool plugin, tests) instead of running the scripts once per
+batch of files:
+
+    translator = Translator()
+    result = translator.translate(source, path='src/pages/Home.jsx')
+    result.text, result.matches
+
+A source can be a str, UTF-8 bytes or a text or binary stream. What is
+translated depends on the kind: 'js' (string literals and JSX text, as
+the scripts do), 'html', 'json' (string values only) or 'text' (all of
+it). The kind follows the path's extension and defaults to 'js', and the
+path also picks the dictionary overlays of its scopes (see scopes.py).
+"""
+import time
+from collections import namedtuple
+from pathlib import Path
+
+from .arabic import ARABIC_OR_ESCAPE, ARABIC_WORD
+from .fileio import atomic_write
+from .journal import journal_edits
+from .jsonstream import json_matches
+from .lexer import source_matches
+from .matcher import apply_matches
+from .memory import TranslationMemory, memory_path
+from .scopes import matcher_for, scoped_matcher
+from .store import DictionaryStore
+
+KINDS = ('js', 'html', 'json', 'text')
+
+_SUFFIX_KINDS = {'.js': 'js', '.jsx': 'js', '.mjs': 'js', '.cjs': 'js', '.ts': 'js', '.tsx': 'js',
+                 '.html': 'html', '.htm': 'html', '.json': 'json'}
+
+# The translated text and the match records it was made from
+Translation = namedtuple('Translation', 'text matches')
+
+
+def kind_of(path, default='js'):
+    """The kind of a file, from its extension."""
+    if path is None:
+        return default
+    return _SUFFIX_KINDS.get(Path(path).suffix.lower(), 'text')
+
+
+def _decode(source):
+    if hasattr(source, 'read'):
+        source = source.read()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = bytes(source).decode('utf-8')
+    return source
+
+
+class Translator:
+    """A DictionaryStore's matcher, compiled (or loaded from cache) once."""
+
+    def __init__(self, store=None, clitics=False, include_comments=False, normalize=False, memory=True):
+        self.store = store or DictionaryStore()
+        self.clitics = clitics
+        self.include_comments = include_comments
+        self.normalize = normalize
+        self.memory = memory
+        self.matcher = None
+        self._load()
+
+    def _load(self):
+        started = time.perf_counter()
+        memory = None
+        if self.memory:
+            options = {'clitics': self.clitics, 'normalize': self.normalize, 'rules': self.store.rules_hash(),
+                       'scopes': self.store.scopes_hash()}
+            memory = TranslationMemory.load(memory_path(self.store.translations(), options))
+        self.matcher = scoped_matcher(self.store, self.clitics, self.normalize, memory)
+        self.load_seconds = time.perf_counter() - started
+
+    def reload(self):
+        """Pick up dictionary and rule changes made since the matcher was built."""
+        self.save_memory()
+        self.store = DictionaryStore(self.store.directory, self.store.layer_names)
+        self._load()
+
+    def save_memory(self):
+        memory = getattr(self.matcher, 'memory', None)
+        if isinstance(memory, TranslationMemory):
+            memory.save()
+
+    def matches(self, text, kind='js', path=None):
+        """Match records for text (from path, if given), in text order."""
+        if kind not in KINDS:
+            raise ValueError(f'unknown kind {kind!r} (expected one of {", ".join(KINDS)})')
+        # JSON can spell its Arabic as \u06xx escapes
+        if not (ARABIC_OR_ESCAPE if kind == 'json' else ARABIC_WORD).search(text):
+            return []
+        matcher, _ = matcher_for(self.matcher, path)
+        if kind == 'json':
+            return json_matches(matcher, text)
+        if kind == 'text':
+            return matcher.matches(text)
+        return source_matches(matcher, text, self.include_comments, html=kind == 'html')
+
+    def translate(self, source, kind=None, path=None):
+        """Translate a str, bytes or stream; returns a Translation."""
+        text = _decode(source)
+        matches = self.matches(text, kind or kind_of(path), path)
+        return Translation(apply_matches(text, matches) if matches else text, matches)
+
+    def translate_path(self, path, kind=None, write=False):
+        """Translate a file; with write, replace it when anything changed.
+
+        Returns (Translation, journal edits of what was written or None).
+        """
+        with open(path, encoding='utf-8', newline='') as f:
+            text = f.read()
+        result = self.translate(text, kind, path)
+        if not (write and result.matches):
+            return result, None
+        atomic_write(path, result.text)
+        return result, journal_edits(text, result.matches)
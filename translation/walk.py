@@ -0,0 +1,164 @@
+"""Single-pass source tree walker with .gitignore-style exclusions.
+
+One os.scandir walk per root yields every file with a wanted extension,
+lazily and in a stable (sorted) order, so translation starts on the first
+file while the rest of the tree is still being listed. Excluded
+directories are pruned without being entered.
+
+Patterns follow .gitignore: 'dist/' matches directories only, a pattern
+with a '/' in it is anchored to the working directory, '*' and '?' stay
+within one path component, '**' crosses them, and '!pattern' re-includes.
+"""
+import os
+import re
+import sys
+from pathlib import Path
+
+DEFAULT_EXTENSIONS = ('.js', '.jsx')
+
+# Never worth translating: build output, dependencies and static assets
+DEFAULT_EXCLUDES = ('.git/', 'node_modules/', 'dist/', 'build/', 'public/')
+
+
+def _glob_regex(pattern):
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            out.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            out.append('[^/]')
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(out)
+
+
+class IgnoreRules:
+    """Ordered .gitignore-style patterns; the last one that matches decides."""
+
+    def __init__(self, patterns=DEFAULT_EXCLUDES):
+        self.rules = []
+        self._combined = None
+        for pattern in patterns:
+            self.add(pattern)
+
+    def add(self, pattern):
+        pattern = pattern.strip()
+        if not pattern or pattern.startswith('#'):
+            return
+        negate = pattern.startswith('!')
+        pattern = pattern.lstrip('!')
+        dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        if '/' in pattern:
+            regex = '^' + _glob_regex(pattern.lstrip('/')) + '$'
+        else:
+            regex = '^(?:.*/)?' + _glob_regex(pattern) + '$'
+        self.rules.append((negate, dir_only, re.compile(regex)))
+        self._combined = None
+
+    def add_file(self, path):
+        """Append the patterns of an ignore file, if it exists."""
+        try:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    self.add(line)
+        except FileNotFoundError:
+            pass
+        return self
+
+    def _combine(self):
+        # Without '!' rules the order does not matter: one alternation for
+        # directories and one for files answer every question in one match
+        if any(negate for negate, _, _ in self.rules):
+            self._combined = False
+            return
+        never = re.compile(r'(?!)')
+        dirs = [r.pattern for _, _, r in self.rules]
+        files = [r.pattern for _, dir_only, r in self.rules if not dir_only]
+        self._combined = (re.compile('|'.join(dirs)) if dirs else never,
+                          re.compile('|'.join(files)) if files else never)
+
+    def ignored(self, path, is_dir=False):
+        """Is path (relative to the working directory, '/'-separated) excluded?"""
+        if self._combined is None:
+            self._combine()
+        if self._combined:
+            return self._combined[0 if is_dir else 1].match(path) is not None
+        result = False
+        for negate, dir_only, regex in self.rules:
+            if (is_dir or not dir_only) and regex.match(path):
+                result = not negate
+        return result
+
+    def excludes(self, path):
+        """ignored() for a file path, including its parent directories."""
+        parts = relative_path(path).split('/')
+        return (any(self.ignored('/'.join(parts[:i]), is_dir=True) for i in range(1, len(parts)))
+                or self.ignored('/'.join(parts)))
+
+
+def relative_path(path):
+    """path as the ignore rules see it: relative to the working directory."""
+    rel = os.path.relpath(path)
+    return Path(path).as_posix() if rel.startswith('..') else rel.replace(os.sep, '/')
+
+
+def walk(roots, extensions=DEFAULT_EXTENSIONS, ignore=None):
+    """Yield the Paths under roots that have a wanted extension.
+
+    A root that is a file is yielded as given, whatever its extension.
+    """
+    ignore = IgnoreRules() if ignore is None else ignore
+    extensions = tuple(extensions)
+    seen = set()
+    for root in roots:
+        root = Path(root)
+        if not root.is_dir():
+            if root not in seen:
+                seen.add(root)
+                yield root
+            continue
+        # Relative paths for the ignore rules are built up as we descend
+        # instead of being recomputed for every entry
+        base = relative_path(root)
+        stack = [(str(root), '' if base == '.' else base + '/')]
+        while stack:
+            directory, rel = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError as e:
+                print(f'✗ {directory}: {e}', file=sys.stderr)
+                continue
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not ignore.ignored(rel + entry.name, is_dir=True):
+                        subdirs.append((entry.path, rel + entry.name + '/'))
+                elif entry.name.endswith(extensions) and not ignore.ignored(rel + entry.name):
+                    path = Path(entry.path)
+                    if path not in seen:
+                        seen.add(path)
+                        yield path
+            # Depth first, in name order
+            stack.extend(reversed(subdirs))
+
+
+def read_path_list(source):
+    """Paths listed one per line in a file ('-' for stdin)."""
+    f = sys.stdin if str(source) == '-' else open(source, encoding='utf-8')
+    try:
+        return [Path(line.rstrip('\n')) for line in f if line.strip()]
+    finally:
+        if f is not sys.stdin:
+            f.close()
@@ -0,0 +1,226 @@
+"""--watch: re-translate files as they are saved, e.g. next to `vite`.
+
+inotify is used directly through libc on Linux; anywhere else (or on file
+systems that do not deliver inotify events, like some container mounts)
+the tree is polled by mtime/size instead. Bursts of events are debounced
+into one batch so an editor's save-as-rename or a branch checkout is
+handled once.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+# Quiet period that closes a batch of events, and how often to poll
+DEBOUNCE = 0.03
+POLL_INTERVAL = 0.25
+
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE_SELF = 0x400
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+# close-write and moved-to are the points where a saved file is complete
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE_SELF
+_EVENT = struct.Struct('iIII')
+
+
+class WatchTarget:
+    """What to watch: directories, whether to recurse, and which files count."""
+
+    def __init__(self, dirs, wanted, recursive=True, skip_dir=None):
+        self.dirs = [Path(d) for d in dirs]
+        self.wanted = wanted
+        self.recursive = recursive
+        self.skip_dir = skip_dir or (lambda path: False)
+
+    def walk(self):
+        """Every directory to watch."""
+        for root in self.dirs:
+            yield root
+            if self.recursive:
+                for dirpath, dirnames, _ in os.walk(root):
+                    dirnames[:] = sorted(d for d in dirnames if not self.skip_dir(Path(dirpath, d)))
+                    for name in dirnames:
+                        yield Path(dirpath, name)
+
+    def files(self, directory):
+        """The wanted files directly inside directory."""
+        try:
+            with os.scandir(directory) as it:
+                return [Path(e.path) for e in it if e.is_file() and self.wanted(Path(e.path))]
+        except OSError:
+            return []
+
+
+class InotifyWatcher:
+    """Linux inotify, one watch descriptor per directory."""
+
+    def __init__(self, target):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.target = target
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs = {}
+        for directory in target.walk():
+            self._watch(directory)
+
+    def _watch(self, directory):
+        wd = self._add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, 'inotify watch limit reached (fs.inotify.max_user_watches)')
+            return
+        self.dirs[wd] = Path(directory)
+
+    def _new_directory(self, directory, changed):
+        # Files can land in a new directory before its watch exists
+        if self.target.skip_dir(directory):
+            return
+        dirs = [directory]
+        if self.target.recursive:
+            for dirpath, dirnames, _ in os.walk(directory):
+                dirnames[:] = [d for d in dirnames if not self.target.skip_dir(Path(dirpath, d))]
+                dirs.extend(Path(dirpath, d) for d in dirnames)
+        for d in dirs:
+            self._watch(d)
+            changed.update(self.target.files(d))
+
+    def wait(self, timeout=None):
+        """Paths touched since the last call; blocks up to timeout seconds."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    # Events were lost: fall back to everything
+                    for directory in self.dirs.values():
+                        changed.update(self.target.files(directory))
+                    continue
+                if mask & _IN_IGNORED:
+                    self.dirs.pop(wd, None)
+                    continue
+                directory = self.dirs.get(wd)
+                if directory is None or not name:
+                    continue
+                path = directory / os.fsdecode(name)
+                if mask & _IN_ISDIR:
+                    if self.target.recursive and mask & (_IN_CREATE | _IN_MOVED_TO):
+                        self._new_directory(path, changed)
+                elif mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO) and self.target.wanted(path):
+                    changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Portable fallback: compare mtime/size of the wanted files."""
+
+    def __init__(self, target, interval=POLL_INTERVAL):
+        self.target = target
+        self.interval = interval
+        self.state = self._scan()
+
+    def _scan(self):
+        state = {}
+        for directory in self.target.walk():
+            for path in self.target.files(directory):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                state[path] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def wait(self, timeout=None):
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        state = self._scan()
+        changed = {p for p, sig in state.items() if self.state.get(p) != sig}
+        self.state = state
+        return changed
+
+    def close(self):
+        pass
+
+
+def open_watcher(target, mode='auto'):
+    """An inotify watcher when possible (mode 'auto' or 'inotify'), else polling."""
+    if mode != 'poll':
+        try:
+            return InotifyWatcher(target)
+        except (OSError, AttributeError):
+            if mode == 'inotify':
+                raise
+    return PollingWatcher(target)
+
+
+def batches(watcher, debounce=DEBOUNCE):
+    """Yield sets of changed paths, each closed by a quiet period of debounce seconds."""
+    while True:
+        changed = watcher.wait()
+        if not changed:
+            continue
+        while True:
+            more = watcher.wait(debounce)
+            if not more:
+                break
+            changed |= more
+        yield sorted(changed)
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def watch(target, process_file, mode='auto', debounce=DEBOUNCE, on_batch=None):
+    """Yield (file_path, result) for every file saved under target, forever.
+
+    process_file runs in this process, so the compiled matcher stays in
+    memory between saves. Our own writes show up as events too; a file
+    whose mtime and size are still what we left behind is not processed
+    again.
+    """
+    written = {}
+    watcher = open_watcher(target, mode)
+    try:
+        for changed in batches(watcher, debounce):
+            for file_path in changed:
+                signature = _signature(file_path)
+                if signature is None or written.get(file_path) == signature:
+                    continue
+                result = process_file(file_path)
+                written[file_path] = _signature(file_path)
+                yield file_path, result
+            if on_batch is not None:
+                on_batch()
+    finally:
+        watcher.close()